@@ -0,0 +1,120 @@
+import copy
+from threading import RLock
+
+from cachetools import TTLCache
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+# Reverse one-to-one profiles loaded with the user, so permission checks can
+# read them without a query
+PROFILE_RELATIONS = ("employer", "jobseeker")
+
+_user_cache = TTLCache(
+    maxsize=settings.AUTH_USER_CACHE_SIZE, ttl=settings.AUTH_USER_CACHE_TTL
+)
+_user_cache_lock = RLock()
+
+
+def _shared_cache_key(user_id):
+    return f"auth-user:{user_id}"
+
+
+def _copy_user(user):
+    """Copy a cached user along with its cached profiles"""
+    user = copy.copy(user)
+    for name in PROFILE_RELATIONS:
+        relation = user._meta.get_field(name)
+        profile = relation.get_cached_value(user, default=None)
+        if profile is not None:
+            profile = copy.copy(profile)
+            relation.set_cached_value(user, profile)
+            relation.field.set_cached_value(profile, user)
+    return user
+
+
+def invalidate_cached_user(user_id):
+    """Drop a user from the authentication caches after it changed"""
+    user_id = str(user_id)
+    with _user_cache_lock:
+        _user_cache.pop(user_id, None)
+    if settings.AUTH_USER_CACHE_SHARED:
+        cache.delete(_shared_cache_key(user_id))
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that resolves users from a short-lived cache.
+
+    Users are cached per process for AUTH_USER_CACHE_TTL seconds, keyed by
+    user id and the token's revocation claim (a fingerprint of the password
+    when SIMPLE_JWT["CHECK_REVOKE_TOKEN"] is on), and optionally in the shared
+    Django cache. Saving or deleting a user or one of its profiles
+    invalidates both; other processes see the change at the latest when their
+    local entry expires.
+
+    Users are loaded with their employer and job seeker profiles in one
+    query, so `request.user.employer` never queries.
+    """
+
+    def _load_user(self, validated_token):
+        """simplejwt's user lookup, with the profiles joined in"""
+        try:
+            user = self.user_model.objects.select_related(*PROFILE_RELATIONS).get(
+                **{
+                    api_settings.USER_ID_FIELD: validated_token[
+                        api_settings.USER_ID_CLAIM
+                    ]
+                }
+            )
+        except self.user_model.DoesNotExist:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN and validated_token.get(
+            api_settings.REVOKE_TOKEN_CLAIM
+        ) != get_md5_hash_password(user.password):
+            raise AuthenticationFailed(
+                _("The user's password has been changed."), code="password_changed"
+            )
+
+        return user
+
+    def get_user(self, validated_token):
+        try:
+            user_id = str(validated_token[api_settings.USER_ID_CLAIM])
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        # Entries only match tokens carrying the same version they were cached for
+        version = validated_token.get(api_settings.REVOKE_TOKEN_CLAIM, "")
+        with _user_cache_lock:
+            entry = _user_cache.get(user_id)
+
+        if entry is None and settings.AUTH_USER_CACHE_SHARED:
+            entry = cache.get(_shared_cache_key(user_id))
+            if entry is not None:
+                with _user_cache_lock:
+                    _user_cache[user_id] = entry
+
+        user = entry[1] if entry is not None and entry[0] == version else None
+        if user is None:
+            user = self._load_user(validated_token)
+            entry = (version, user)
+            with _user_cache_lock:
+                _user_cache[user_id] = entry
+            if settings.AUTH_USER_CACHE_SHARED:
+                cache.set(
+                    _shared_cache_key(user_id), entry, settings.AUTH_USER_CACHE_TTL
+                )
+        elif not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        # Views may modify request.user, so never hand out the cached instance
+        return _copy_user(user)
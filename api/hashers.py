@@ -0,0 +1,46 @@
+from django.conf import settings
+from django.contrib.auth.hashers import (
+    Argon2PasswordHasher,
+    PBKDF2PasswordHasher,
+    ScryptPasswordHasher,
+)
+
+# Work factors come from settings.PASSWORD_HASHER_PARAMS. Django compares them
+# with the parameters stored in each hash on login, so changing them makes
+# `check_password` transparently rehash the password with the new cost.
+
+
+class ConfigurablePBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    @property
+    def iterations(self):
+        return settings.PASSWORD_HASHER_PARAMS["pbkdf2"]["iterations"]
+
+
+class ConfigurableScryptPasswordHasher(ScryptPasswordHasher):
+    @property
+    def work_factor(self):
+        return settings.PASSWORD_HASHER_PARAMS["scrypt"]["work_factor"]
+
+    @property
+    def block_size(self):
+        return settings.PASSWORD_HASHER_PARAMS["scrypt"]["block_size"]
+
+    @property
+    def parallelism(self):
+        return settings.PASSWORD_HASHER_PARAMS["scrypt"]["parallelism"]
+
+
+class ConfigurableArgon2PasswordHasher(Argon2PasswordHasher):
+    """Requires the optional `argon2-cffi` package"""
+
+    @property
+    def time_cost(self):
+        return settings.PASSWORD_HASHER_PARAMS["argon2"]["time_cost"]
+
+    @property
+    def memory_cost(self):
+        return settings.PASSWORD_HASHER_PARAMS["argon2"]["memory_cost"]
+
+    @property
+    def parallelism(self):
+        return settings.PASSWORD_HASHER_PARAMS["argon2"]["parallelism"]
@@ -0,0 +1,45 @@
+from datetime import datetime, timezone
+
+from django.core.management.base import BaseCommand
+
+from api.utils.order_utils import fulfil_checkout_sessions
+from api.utils.stripe_utils import get_stripe_client
+
+
+class Command(BaseCommand):
+    help = "Replay completed Stripe checkout sessions into orders in batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument(
+            "--since",
+            type=datetime.fromisoformat,
+            help="Only replay sessions created at or after this ISO date",
+        )
+
+    def handle(self, *args, **options):
+        params = {"status": "complete", "limit": 100, "expand": ["data.line_items"]}
+        if options["since"]:
+            since = options["since"]
+            if since.tzinfo is None:
+                since = since.replace(tzinfo=timezone.utc)
+            params["created"] = {"gte": int(since.timestamp())}
+
+        batch = []
+        total = 0
+        sessions = get_stripe_client().checkout.sessions.list(params=params)
+        for session in sessions.auto_paging_iter():
+            if session.payment_status != "paid":
+                continue
+            batch.append((session, session.line_items.data))
+            if len(batch) >= options["batch_size"]:
+                fulfil_checkout_sessions(batch)
+                total += len(batch)
+                batch = []
+                self.stdout.write(f"Replayed {total} sessions")
+
+        if batch:
+            fulfil_checkout_sessions(batch)
+            total += len(batch)
+
+        self.stdout.write(self.style.SUCCESS(f"Replayed {total} checkout sessions"))
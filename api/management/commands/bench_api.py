@@ -0,0 +1,333 @@
+import hashlib
+import hmac
+import itertools
+import json
+import math
+import re
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import Client, override_settings
+from faker import Faker
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from api.models.order import Order, OrderLineItem
+from api.models.user import CustomUser
+from api.models.webhook import StripeEvent
+
+ENDPOINTS = ("register", "login", "token_refresh", "orders", "webhook")
+BENCHMARK_PASSWORD = "correct-horse-battery-staple"
+WEBHOOK_SECRET = "whsec_benchmark"
+SERVER_TIMING_QUERIES = re.compile(r'desc="(\d+) queries"')
+
+
+def percentile(sorted_values, percent):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(percent / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed users and orders, then drive the auth, order and webhook endpoints "
+        "in-process at the given concurrency and report latency percentiles, "
+        "throughput and queries per request"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=50)
+        parser.add_argument("--orders-per-user", type=int, default=20)
+        parser.add_argument(
+            "--requests", type=int, default=200, help="Requests per endpoint"
+        )
+        parser.add_argument("--concurrency", type=int, default=8)
+        parser.add_argument(
+            "--endpoints",
+            default=",".join(ENDPOINTS),
+            help=f"Comma-separated subset of {', '.join(ENDPOINTS)}",
+        )
+        parser.add_argument("--output", help="Write the results to this JSON file")
+        parser.add_argument(
+            "--baseline",
+            help="Fail if results regress against this JSON file from --output",
+        )
+        parser.add_argument(
+            "--tolerance",
+            type=float,
+            default=0.2,
+            help="Allowed p95 latency increase over the baseline, as a fraction",
+        )
+        parser.add_argument(
+            "--keep", action="store_true", help="Keep the seeded data afterwards"
+        )
+
+    def handle(self, *args, **options):
+        endpoints = options["endpoints"].split(",")
+        unknown = set(endpoints) - set(ENDPOINTS)
+        if unknown:
+            raise CommandError(f"Unknown endpoints: {', '.join(sorted(unknown))}")
+
+        self.fake = Faker()
+        self.run_id = uuid.uuid4().hex[:8]
+        self.email_prefix = f"bench-{self.run_id}-"
+
+        results = {}
+        with override_settings(
+            ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"],
+            # Measure the endpoints, not the rate limits
+            REST_FRAMEWORK={**settings.REST_FRAMEWORK, "DEFAULT_THROTTLE_RATES": {}},
+            QUERY_INSTRUMENTATION=True,
+            STRIPE_SECRET_KEY=settings.STRIPE_SECRET_KEY or "sk_test_benchmark",
+            STRIPE_WEBHOOK_SECRET=WEBHOOK_SECRET,
+        ):
+            try:
+                users = self._seed(options["users"], options["orders_per_user"])
+                for name in endpoints:
+                    results[name] = self._run(
+                        name, users, options["requests"], options["concurrency"]
+                    )
+                    self._report(name, results[name])
+            finally:
+                if not options["keep"]:
+                    self._cleanup()
+
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                json.dump(results, f, indent=2)
+        if options["baseline"]:
+            self._compare(results, options["baseline"], options["tolerance"])
+
+    def _seed(self, user_count, orders_per_user):
+        start = time.perf_counter()
+        # Hashing once keeps seeding fast; logins still verify the hash
+        password = make_password(BENCHMARK_PASSWORD)
+        users = CustomUser.objects.bulk_create(
+            CustomUser(
+                email=f"{self.email_prefix}{i}-{self.fake.user_name()}@example.com",
+                password=password,
+                user_type=self.fake.random_element(["JS", "EM"]),
+            )
+            for i in range(user_count)
+        )
+
+        orders = []
+        line_items = []
+        for user in users:
+            for _ in range(orders_per_user):
+                session_id = f"cs_bench_{self.run_id}_{len(orders)}"
+                quantity = self.fake.random_int(1, 3)
+                unit_amount = Decimal(self.fake.random_int(500, 20000)) / 100
+                orders.append(
+                    Order(
+                        user=user,
+                        email=user.email,
+                        stripe_session_id=session_id,
+                        payment_status=Order.Status.PAID,
+                        amount_total=unit_amount * quantity,
+                    )
+                )
+                line_items.append(
+                    OrderLineItem(
+                        order_id=session_id,
+                        stripe_line_item_id=f"li_bench_{self.run_id}_{len(orders)}",
+                        price_id=f"price_{self.fake.lexify('????????')}",
+                        product_id=f"prod_{self.fake.lexify('????????')}",
+                        description=self.fake.catch_phrase()[:255],
+                        quantity=quantity,
+                        unit_amount=unit_amount,
+                        currency="usd",
+                    )
+                )
+        Order.objects.bulk_create(orders, batch_size=1000)
+        OrderLineItem.objects.bulk_create(line_items, batch_size=1000)
+
+        self.stdout.write(
+            f"Seeded {len(users)} users and {len(orders)} orders "
+            f"in {time.perf_counter() - start:.1f}s"
+        )
+        return users
+
+    def _cleanup(self):
+        users = CustomUser.objects.filter(email__startswith=self.email_prefix)
+        OutstandingToken.objects.filter(user__in=users).delete()
+        users.delete()
+        Order.objects.filter(
+            stripe_session_id__startswith=f"cs_bench_{self.run_id}_"
+        ).delete()
+        StripeEvent.objects.filter(
+            event_id__startswith=f"evt_bench_{self.run_id}_"
+        ).delete()
+
+    def _run(self, name, users, total, concurrency):
+        """Send `total` requests to one endpoint from `concurrency` threads"""
+        counter = itertools.count()
+        request = getattr(self, f"_request_{name}")
+
+        def worker(index):
+            client = Client(raise_request_exception=False)
+            user = users[index % len(users)]
+            state = {"user": user}
+            if name in ("token_refresh", "orders"):
+                refresh = RefreshToken.for_user(user)
+                state["refresh"] = str(refresh)
+                state["access"] = str(refresh.access_token)
+
+            samples = []
+            try:
+                while (i := next(counter)) < total:
+                    start = time.perf_counter()
+                    response = request(client, state, i)
+                    elapsed = time.perf_counter() - start
+                    match = SERVER_TIMING_QUERIES.search(
+                        response.get("Server-Timing", "")
+                    )
+                    samples.append(
+                        (
+                            elapsed,
+                            response.status_code,
+                            int(match.group(1)) if match else None,
+                        )
+                    )
+            finally:
+                # Each thread opened its own database connections
+                connections.close_all()
+            return samples
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            samples = list(
+                itertools.chain.from_iterable(executor.map(worker, range(concurrency)))
+            )
+        wall = time.perf_counter() - start
+
+        latencies = sorted(elapsed * 1000 for elapsed, _, _ in samples)
+        queries = [count for _, _, count in samples if count is not None]
+        return {
+            "requests": len(samples),
+            "errors": sum(1 for _, status, _ in samples if status >= 400),
+            "throughput": round(len(samples) / wall, 1),
+            "p50_ms": round(percentile(latencies, 50), 2),
+            "p95_ms": round(percentile(latencies, 95), 2),
+            "p99_ms": round(percentile(latencies, 99), 2),
+            "queries": round(sum(queries) / len(queries), 2) if queries else None,
+        }
+
+    def _request_register(self, client, state, i):
+        return client.post(
+            "/api/register/",
+            {
+                "email": f"{self.email_prefix}register-{i}@example.com",
+                "password": BENCHMARK_PASSWORD,
+            },
+            content_type="application/json",
+        )
+
+    def _request_login(self, client, state, i):
+        return client.post(
+            "/api/login/",
+            {"email": state["user"].email, "password": BENCHMARK_PASSWORD},
+            content_type="application/json",
+        )
+
+    def _request_token_refresh(self, client, state, i):
+        response = client.post(
+            "/api/token/refresh/",
+            {"refresh": state["refresh"]},
+            content_type="application/json",
+        )
+        if response.status_code == 200:
+            # Refresh tokens are rotated and the old one blacklisted
+            state["refresh"] = response.json().get("refresh", state["refresh"])
+        return response
+
+    def _request_orders(self, client, state, i):
+        return client.get(
+            "/api/orders/", HTTP_AUTHORIZATION=f"Bearer {state['access']}"
+        )
+
+    def _request_webhook(self, client, state, i):
+        payload = json.dumps(
+            {
+                "id": f"evt_bench_{self.run_id}_{i}",
+                "object": "event",
+                "type": "checkout.session.completed",
+                "data": {
+                    "object": {
+                        "id": f"cs_bench_{self.run_id}_webhook_{i}",
+                        "object": "checkout.session",
+                        "customer_email": state["user"].email,
+                        "amount_total": self.fake.random_int(500, 20000),
+                        "payment_status": "paid",
+                        "metadata": {"user_id": str(state["user"].id)},
+                    }
+                },
+            }
+        )
+        # Signed the way Stripe signs webhook deliveries
+        timestamp = int(time.time())
+        signature = hmac.new(
+            WEBHOOK_SECRET.encode(),
+            f"{timestamp}.{payload}".encode(),
+            hashlib.sha256,
+        ).hexdigest()
+        return client.post(
+            "/api/webhook/",
+            payload,
+            content_type="application/json",
+            HTTP_STRIPE_SIGNATURE=f"t={timestamp},v1={signature}",
+        )
+
+    def _report(self, name, result):
+        queries = "-" if result["queries"] is None else f"{result['queries']:.1f}"
+        line = (
+            f"{name}: {result['requests']} requests, {result['errors']} errors, "
+            f"{result['throughput']:.1f} req/s, p50 {result['p50_ms']:.1f}ms, "
+            f"p95 {result['p95_ms']:.1f}ms, p99 {result['p99_ms']:.1f}ms, "
+            f"{queries} queries/request"
+        )
+        style = self.style.WARNING if result["errors"] else self.style.SUCCESS
+        self.stdout.write(style(line))
+
+    def _compare(self, results, baseline_path, tolerance):
+        with open(baseline_path) as f:
+            baseline = json.load(f)
+
+        regressions = []
+        for name, result in results.items():
+            if name not in baseline:
+                continue
+            before = baseline[name]
+            if result["p95_ms"] > before["p95_ms"] * (1 + tolerance):
+                regressions.append(
+                    f"{name}: p95 {result['p95_ms']:.1f}ms, "
+                    f"baseline {before['p95_ms']:.1f}ms"
+                )
+            if (
+                result["queries"] is not None
+                and before.get("queries") is not None
+                and result["queries"] > before["queries"]
+            ):
+                regressions.append(
+                    f"{name}: {result['queries']:.1f} queries/request, "
+                    f"baseline {before['queries']:.1f}"
+                )
+            if result["errors"] > before.get("errors", 0):
+                regressions.append(
+                    f"{name}: {result['errors']} errors, "
+                    f"baseline {before.get('errors', 0)}"
+                )
+
+        if regressions:
+            raise CommandError(
+                "Regressions against baseline:\n" + "\n".join(regressions)
+            )
+        self.stdout.write(self.style.SUCCESS("No regressions against the baseline"))
@@ -0,0 +1,69 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+
+from api.utils.email_rendering import render_email
+
+SAMPLE_CONTEXTS = {
+    "application_confirmation": {
+        "applicant_name": "applicant@example.com",
+        "job_title": "Senior Backend Engineer",
+        "company_name": "Example Corp",
+        "application_date": "January 01, 2025",
+    },
+    "employer_notification": {
+        "employer_name": "Example Corp",
+        "job_title": "Senior Backend Engineer",
+        "applicant_email": "applicant@example.com",
+        "application_date": "January 01, 2025",
+        "cover_letter": "I would love to join the team. " * 20,
+    },
+}
+
+# The default loaders, without the cached loader Django wraps them in
+UNCACHED_LOADERS = [
+    "django.template.loaders.filesystem.Loader",
+    "django.template.loaders.app_directories.Loader",
+]
+
+
+def _uncached_templates():
+    templates = []
+    for engine in settings.TEMPLATES:
+        engine = {**engine, "APP_DIRS": False}
+        engine["OPTIONS"] = {**engine.get("OPTIONS", {}), "loaders": UNCACHED_LOADERS}
+        templates.append(engine)
+    return templates
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the per-render cost of render_email with Django's cached "
+        "template loader and without it"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=1000)
+
+    def _time(self, name, context, iterations):
+        # Warm up so only steady-state rendering is measured
+        render_email(name, context)
+        start = time.perf_counter()
+        for _ in range(iterations):
+            render_email(name, context)
+        return (time.perf_counter() - start) / iterations * 1_000_000
+
+    def handle(self, *args, **options):
+        iterations = options["iterations"]
+        for name, context in SAMPLE_CONTEXTS.items():
+            cached = self._time(name, context, iterations)
+            # Changing TEMPLATES rebuilds the template engines
+            with override_settings(TEMPLATES=_uncached_templates()):
+                uncached = self._time(name, context, iterations)
+
+            self.stdout.write(
+                f"{name}: {uncached:.1f}us per email without the cached loader, "
+                f"{cached:.1f}us with it ({uncached / cached:.2f}x)"
+            )
@@ -0,0 +1,99 @@
+import io
+import json
+import time
+import uuid
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from api.parsers import ORJSONParser
+from api.renderers import ORJSONRenderer, orjson
+
+
+def order_page(orders, items_per_order):
+    """An order list page as OrderList renders it, with raw UUIDs and Decimals"""
+    now = timezone.now().replace(microsecond=0)
+    return {
+        "next": "https://api.example.com/api/orders/?cursor=cD0yMDI1",
+        "previous": None,
+        "results": [
+            {
+                "id": i,
+                "user": uuid.uuid4(),
+                "email": f"customer-{i}@example.com",
+                "payment_status": "PAID",
+                "amount_total": Decimal("99.00") * items_per_order,
+                "items": [
+                    {
+                        "price_id": f"price_{i}_{n}",
+                        "product_id": f"prod_{i}_{n}",
+                        "description": "Featured job posting – 30 days",
+                        "quantity": 1,
+                        "unit_amount": Decimal("99.00"),
+                        "currency": "usd",
+                    }
+                    for n in range(items_per_order)
+                ],
+                "created_at": now - timedelta(minutes=i),
+            }
+            for i in range(orders)
+        ],
+    }
+
+
+class Command(BaseCommand):
+    help = "Compare JSONRenderer/JSONParser with the orjson pair on order list pages"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--orders", type=int, default=100)
+        parser.add_argument("--items-per-order", type=int, default=5)
+        parser.add_argument("--iterations", type=int, default=500)
+
+    def _time(self, func, iterations):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        return (time.perf_counter() - start) / iterations * 1_000_000
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            raise CommandError("orjson is not installed")
+
+        data = order_page(options["orders"], options["items_per_order"])
+        iterations = options["iterations"]
+
+        stdlib_body = JSONRenderer().render(data)
+        orjson_body = ORJSONRenderer().render(data)
+        if json.loads(stdlib_body) != json.loads(orjson_body):
+            raise CommandError("The renderers disagree on the rendered page")
+
+        results = [
+            (
+                "render",
+                self._time(lambda: JSONRenderer().render(data), iterations),
+                self._time(lambda: ORJSONRenderer().render(data), iterations),
+            ),
+            (
+                "parse",
+                self._time(
+                    lambda: JSONParser().parse(io.BytesIO(stdlib_body)), iterations
+                ),
+                self._time(
+                    lambda: ORJSONParser().parse(io.BytesIO(stdlib_body)), iterations
+                ),
+            ),
+        ]
+
+        self.stdout.write(
+            f"{options['orders']} orders x {options['items_per_order']} items, "
+            f"{len(stdlib_body) / 1024:.1f}KiB"
+        )
+        for name, stdlib, fast in results:
+            self.stdout.write(
+                f"{name}: stdlib {stdlib:.1f}us, orjson {fast:.1f}us per page "
+                f"({stdlib / fast:.2f}x)"
+            )
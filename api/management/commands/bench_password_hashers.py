@@ -0,0 +1,86 @@
+import time
+
+from django.conf import settings
+from django.contrib.auth import authenticate
+from django.contrib.auth.hashers import get_hasher
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import override_settings
+
+from api.models.user import CustomUser
+
+BENCHMARK_EMAIL = "hasher-benchmark@example.com"
+BENCHMARK_PASSWORD = "correct-horse-battery-staple"
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = "Measure single-worker login throughput for each password hashing policy"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--policies",
+            default=",".join(settings.PASSWORD_HASHER_CLASSES),
+            help="Comma-separated policies from PASSWORD_HASHER_CLASSES",
+        )
+        parser.add_argument(
+            "--duration",
+            type=float,
+            default=3.0,
+            help="Seconds to run each measurement for",
+        )
+
+    def _rate(self, func, duration):
+        count = 0
+        start = time.perf_counter()
+        while time.perf_counter() - start < duration:
+            func()
+            count += 1
+        return count / (time.perf_counter() - start)
+
+    def _login_rate(self, duration):
+        """Logins per second through `authenticate`, including the user lookup"""
+        rate = 0.0
+        try:
+            with transaction.atomic():
+                CustomUser.objects.create_user(
+                    email=BENCHMARK_EMAIL, password=BENCHMARK_PASSWORD
+                )
+                rate = self._rate(
+                    lambda: authenticate(
+                        email=BENCHMARK_EMAIL, password=BENCHMARK_PASSWORD
+                    ),
+                    duration,
+                )
+                raise _Rollback
+        except _Rollback:
+            pass
+        return rate
+
+    def handle(self, *args, **options):
+        for name in options["policies"].split(","):
+            with override_settings(
+                PASSWORD_HASHERS=[settings.PASSWORD_HASHER_CLASSES[name]]
+            ):
+                hasher = get_hasher("default")
+                try:
+                    encoded = hasher.encode(BENCHMARK_PASSWORD, hasher.salt())
+                except ValueError as e:
+                    # Optional hashing library is not installed
+                    self.stdout.write(self.style.WARNING(f"{name}: skipped ({e})"))
+                    continue
+
+                verify_rate = self._rate(
+                    lambda: hasher.verify(BENCHMARK_PASSWORD, encoded),
+                    options["duration"],
+                )
+                login_rate = self._login_rate(options["duration"])
+
+            self.stdout.write(
+                f"{name}: {1000 / verify_rate:.1f}ms per hash, "
+                f"{verify_rate:.1f} verifications/s, "
+                f"{login_rate:.1f} logins/s per worker"
+            )
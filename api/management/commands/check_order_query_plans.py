@@ -0,0 +1,102 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from api.models.order import Order
+from api.models.user import CustomUser
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a large Order table inside a transaction, check that the hot "
+        "lookups use their indexes with EXPLAIN, then roll everything back"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--orders", type=int, default=1_000_000)
+        parser.add_argument("--users", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("Query plan checks require PostgreSQL")
+
+        failures = []
+        try:
+            with transaction.atomic():
+                users = self._seed(options["users"], options["orders"])
+                failures = self._check_plans(users[0])
+                raise _Rollback
+        except _Rollback:
+            pass
+
+        if failures:
+            raise CommandError("\n".join(failures))
+        self.stdout.write(self.style.SUCCESS("All order lookups use their indexes"))
+
+    def _seed(self, user_count, order_count):
+        start = time.perf_counter()
+        users = CustomUser.objects.bulk_create(
+            CustomUser(email=f"query-plan-{i}@example.com", password="!")
+            for i in range(user_count)
+        )
+        fields = {field.name: field.column for field in Order._meta.concrete_fields}
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO {Order._meta.db_table} (
+                    {fields["user"]}, {fields["email"]},
+                    {fields["stripe_session_id"]}, {fields["payment_status"]},
+                    {fields["amount_total"]}, {fields["items"]},
+                    {fields["created_at"]}, {fields["updated_at"]}
+                )
+                SELECT
+                    (%s::uuid[])[1 + i %% %s],
+                    'query-plan-' || i || '@example.com',
+                    'cs_query_plan_' || i,
+                    CASE i %% 50 WHEN 0 THEN 'PENDING' WHEN 1 THEN 'FAILED'
+                        ELSE 'PAID' END,
+                    99.00,
+                    '[]'::jsonb,
+                    now() - make_interval(secs => i),
+                    now() - make_interval(secs => i)
+                FROM generate_series(1, %s) AS i
+                """,
+                [[str(user.id) for user in users], user_count, order_count],
+            )
+            cursor.execute(f"ANALYZE {Order._meta.db_table}")
+        self.stdout.write(
+            f"Seeded {order_count} orders for {user_count} users "
+            f"in {time.perf_counter() - start:.1f}s"
+        )
+        return users
+
+    def _check_plans(self, user):
+        checks = [
+            (
+                "order history",
+                Order.objects.filter(user=user).order_by("-created_at")[:10],
+                "order_user_created_idx",
+            ),
+            (
+                "webhook lookup",
+                Order.objects.filter(stripe_session_id="cs_query_plan_42"),
+                "order_stripe_session_id_uniq",
+            ),
+            (
+                "unpaid orders",
+                Order.objects.filter(payment_status=Order.Status.PENDING),
+                "order_unpaid_idx",
+            ),
+        ]
+        failures = []
+        for label, queryset, index_name in checks:
+            plan = queryset.explain()
+            self.stdout.write(f"{label}:\n{plan}\n")
+            if index_name not in plan:
+                failures.append(f"{label} does not use {index_name}:\n{plan}")
+        return failures
@@ -0,0 +1,61 @@
+import logging
+import time
+
+from django.core.management.base import BaseCommand
+
+from api.utils.job_utils import archive_jobs, backfill_job_terms, expire_jobs
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        "Expire job postings past their paid term and archive long expired "
+        "ones, in batches. Active jobs without a term are given one first."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=300.0,
+            help="Seconds to sleep between runs",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Run once and exit instead of polling",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            backfilled, _ = self._drain(backfill_job_terms, options["batch_size"])
+            expired, expire_time = self._drain(expire_jobs, options["batch_size"])
+            archived, archive_time = self._drain(archive_jobs, options["batch_size"])
+            if backfilled or expired or archived or options["once"]:
+                message = (
+                    f"Started {backfilled} missing terms, "
+                    f"expired {expired} jobs in {expire_time:.2f}s, "
+                    f"archived {archived} jobs in {archive_time:.2f}s"
+                )
+                if options["once"]:
+                    self.stdout.write(self.style.SUCCESS(message))
+                else:
+                    logger.info(message)
+
+            if options["once"]:
+                break
+
+            time.sleep(options["interval"])
+
+    def _drain(self, func, batch_size):
+        """Run `func` until a batch comes back short, returning (total, seconds)"""
+        start = time.perf_counter()
+        total = 0
+        while True:
+            count = func(batch_size=batch_size)
+            total += count
+            if count < batch_size:
+                break
+        return total, time.perf_counter() - start
@@ -0,0 +1,149 @@
+import csv
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import django
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.core.validators import validate_email
+from django.db import transaction
+
+from api.models.job_board import Employer, JobSeeker
+from api.models.user import CustomUser
+
+USER_TYPES = {choice for choice, _ in CustomUser.USER_TYPE_CHOICES}
+
+
+def _init_worker():
+    # Hashers are configured from settings, which spawned workers must load
+    django.setup()
+
+
+def _hash_passwords(passwords):
+    # None gives the account an unusable password, like create_user
+    return [make_password(password) for password in passwords]
+
+
+def _read_rows(path, file_format):
+    """Stream `{"email", "password", "user_type"}` rows from a CSV or JSONL file"""
+    with open(path, newline="", encoding="utf-8") as f:
+        if file_format == "csv":
+            yield from csv.DictReader(f)
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def _chunks(items, count):
+    size = max(1, -(-len(items) // count))
+    return [items[i : i + size] for i in range(0, len(items), size)]
+
+
+class Command(BaseCommand):
+    help = (
+        "Import users and their employer/job seeker profiles from a CSV or "
+        "JSONL file with email, password and user_type columns. Existing "
+        "emails are skipped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument(
+            "--format",
+            choices=["csv", "jsonl"],
+            help="File format, detected from the extension by default",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count(),
+            help="Processes hashing passwords",
+        )
+
+    def handle(self, *args, **options):
+        file_format = options["format"] or os.path.splitext(options["path"])[1][1:]
+        if file_format not in ("csv", "jsonl"):
+            raise CommandError("Pass --format csv or --format jsonl")
+
+        self.seen = set()
+        self.imported = self.existing = self.invalid = 0
+        start = time.perf_counter()
+        rows = _read_rows(options["path"], file_format)
+        workers = options["workers"]
+
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker
+        ) as executor:
+            # Hash the next batch in the pool while the previous one is inserted
+            pending = None
+            while batch := list(islice(rows, options["batch_size"])):
+                users = self._prepare(batch)
+                passwords = [password for _, password in users]
+                hashes = executor.map(_hash_passwords, _chunks(passwords, workers))
+                if pending:
+                    self._insert(*pending)
+                pending = ([user for user, _ in users], hashes)
+            if pending:
+                self._insert(*pending)
+
+        elapsed = time.perf_counter() - start
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {self.imported} users in {elapsed:.1f}s "
+                f"({self.existing} already existed, {self.invalid} invalid)"
+            )
+        )
+
+    def _prepare(self, batch):
+        """Validate a batch of rows into unsaved users, skipping known emails"""
+        users = []
+        for row in batch:
+            email = CustomUser.objects.normalize_email((row.get("email") or "").strip())
+            user_type = row.get("user_type") or None
+            try:
+                validate_email(email)
+            except ValidationError:
+                self.invalid += 1
+                continue
+            if user_type is not None and user_type not in USER_TYPES:
+                self.invalid += 1
+                continue
+            if email in self.seen:
+                self.existing += 1
+                continue
+            self.seen.add(email)
+            # CSV has no null, so an empty password means none was given
+            password = row.get("password") or None
+            users.append((CustomUser(email=email, user_type=user_type), password))
+
+        existing = set(
+            CustomUser.objects.filter(
+                email__in=[user.email for user, _ in users]
+            ).values_list("email", flat=True)
+        )
+        self.existing += len(existing)
+        return [
+            (user, password) for user, password in users if user.email not in existing
+        ]
+
+    def _insert(self, users, hashes):
+        for user, password in zip(users, (h for chunk in hashes for h in chunk)):
+            user.password = password
+
+        with transaction.atomic():
+            CustomUser.objects.bulk_create(users)
+            Employer.objects.bulk_create(
+                Employer(user=user) for user in users if user.user_type == "EM"
+            )
+            JobSeeker.objects.bulk_create(
+                JobSeeker(user=user) for user in users if user.user_type == "JS"
+            )
+
+        self.imported += len(users)
+        self.stdout.write(f"Imported {self.imported} users")
@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from api.models.order import Order, OrderLineItem
+from api.utils.order_utils import build_line_items
+
+
+class Command(BaseCommand):
+    help = "Move raw Stripe line item JSON from Order.items into OrderLineItem rows"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        last_pk = 0
+        total = 0
+        while True:
+            orders = list(
+                Order.objects.filter(pk__gt=last_pk)
+                .exclude(items=[])
+                .order_by("pk")
+                .only("pk", "stripe_session_id", "items")[: options["batch_size"]]
+            )
+            if not orders:
+                break
+
+            with transaction.atomic():
+                OrderLineItem.objects.bulk_create(
+                    [
+                        row
+                        for order in orders
+                        for row in build_line_items(
+                            order.stripe_session_id, order.items
+                        )
+                    ],
+                    ignore_conflicts=True,
+                )
+                Order.objects.filter(pk__in=[order.pk for order in orders]).update(
+                    items=[]
+                )
+
+            last_pk = orders[-1].pk
+            total += len(orders)
+            self.stdout.write(f"Migrated {total} orders")
+
+        self.stdout.write(self.style.SUCCESS(f"Migrated line items of {total} orders"))
@@ -0,0 +1,38 @@
+import logging
+import time
+
+from django.core.management.base import BaseCommand
+
+from api.utils.webhook_utils import process_stripe_events
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Process Stripe webhook events stored in the inbox"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=20)
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=2.0,
+            help="Seconds to sleep when there are no pending events",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Drain pending events once and exit instead of polling",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            processed, failed = process_stripe_events(batch_size=options["batch_size"])
+            if processed or failed:
+                logger.info("Processed %d Stripe events, %d failed", processed, failed)
+                continue
+
+            if options["once"]:
+                break
+
+            time.sleep(options["interval"])
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from api.utils.email_utils import prune_sent_emails
+
+
+class Command(BaseCommand):
+    help = "Delete outbound emails sent over EMAIL_QUEUE_RETENTION_DAYS ago in batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        total = prune_sent_emails(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Deleted {total} sent emails"))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from api.utils.webhook_utils import prune_stripe_events
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete Stripe events processed over STRIPE_EVENT_RETENTION_DAYS ago "
+        "in batches"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        total = prune_stripe_events(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Deleted {total} processed events"))
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from api.models.job_board import Job
+from api.utils.search_utils import index_jobs
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search documents of all jobs in batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        last_pk = 0
+        total = 0
+        while True:
+            job_ids = list(
+                Job.objects.filter(pk__gt=last_pk)
+                .order_by("pk")
+                .values_list("pk", flat=True)[: options["batch_size"]]
+            )
+            if not job_ids:
+                break
+
+            total += index_jobs(job_ids)
+            last_pk = job_ids[-1]
+            self.stdout.write(f"Indexed {total} jobs")
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt search documents of {total} jobs")
+        )
@@ -0,0 +1,58 @@
+import logging
+import time
+
+from django.core.mail import get_connection
+from django.core.management.base import BaseCommand
+
+from api.utils.email_utils import deliver_queued_emails
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Deliver queued outbound emails over a single reused SMTP connection"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=50)
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5.0,
+            help="Seconds to sleep when the queue is empty",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Drain the queue once and exit instead of polling",
+        )
+
+    def handle(self, *args, **options):
+        connection = get_connection()
+        try:
+            while True:
+                try:
+                    connection.open()
+                    sent, failed = deliver_queued_emails(
+                        connection, batch_size=options["batch_size"]
+                    )
+                except Exception:
+                    # Drop the connection so the next batch reconnects
+                    logger.exception("Email batch delivery failed")
+                    connection.close()
+                    sent = failed = 0
+
+                if sent or failed:
+                    logger.info("Delivered %d emails, %d failed", sent, failed)
+                    if failed and not sent:
+                        # Likely a dead session rather than bad messages
+                        connection.close()
+                    continue
+
+                if options["once"]:
+                    break
+
+                # Don't hold the SMTP session open while the queue is idle
+                connection.close()
+                time.sleep(options["interval"])
+        finally:
+            connection.close()
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from django.utils import timezone
+
+from api.models.auth import PasswordResetToken
+
+
+class Command(BaseCommand):
+    help = "Delete expired and used password reset tokens in batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        total = 0
+        while True:
+            ids = list(
+                PasswordResetToken.objects.filter(
+                    Q(expires_at__lt=now) | Q(used=True)
+                ).values_list("pk", flat=True)[: options["batch_size"]]
+            )
+            if not ids:
+                break
+
+            PasswordResetToken.objects.filter(pk__in=ids).delete()
+            total += len(ids)
+
+        self.stdout.write(self.style.SUCCESS(f"Deleted {total} password reset tokens"))
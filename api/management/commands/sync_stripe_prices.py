@@ -0,0 +1,85 @@
+import logging
+import time
+
+import stripe
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from api.models.price import StripePrice
+from api.utils.price_utils import get_active_prices
+from api.utils.stripe_utils import get_stripe_client
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Sync active Stripe prices into the local price catalog"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--interval",
+            type=float,
+            help="Keep syncing every this many seconds instead of exiting",
+        )
+
+    def handle(self, *args, **options):
+        if options["interval"] is None:
+            self._sync()
+            return
+
+        while True:
+            try:
+                self._sync()
+            except stripe.StripeError:
+                # Keep the current catalog and try again on the next round
+                logger.exception("Syncing Stripe prices failed")
+            time.sleep(options["interval"])
+
+    def _sync(self):
+        prices = get_stripe_client().prices.list(
+            params={"active": True, "limit": 100, "expand": ["data.product"]}
+        )
+        rows = []
+        for price in prices.auto_paging_iter():
+            if price.unit_amount is None:
+                # Customer-chosen and tiered prices can't be validated locally
+                continue
+            product = price.product
+            rows.append(
+                StripePrice(
+                    price_id=price.id,
+                    product_id=product if isinstance(product, str) else product.id,
+                    product_name="" if isinstance(product, str) else product.name,
+                    unit_amount=price.unit_amount / 100,
+                    currency=price.currency,
+                    active=True,
+                )
+            )
+
+        with transaction.atomic():
+            StripePrice.objects.bulk_create(
+                rows,
+                update_conflicts=True,
+                unique_fields=["price_id"],
+                update_fields=[
+                    "product_id",
+                    "product_name",
+                    "unit_amount",
+                    "currency",
+                    "active",
+                    "updated_at",
+                ],
+            )
+            deactivated = (
+                StripePrice.objects.filter(active=True)
+                .exclude(price_id__in=[row.price_id for row in rows])
+                .update(active=False)
+            )
+
+        # Other processes pick up the change when their cache expires
+        get_active_prices.cache_clear()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Synced {len(rows)} active prices, deactivated {deactivated}"
+            )
+        )
@@ -0,0 +1,246 @@
+import heapq
+import logging
+import re
+import time
+import uuid
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+from api.utils.log_utils import request_id_var
+
+logger = logging.getLogger("api.queries")
+
+REQUEST_ID_PATTERN = re.compile(r"^[A-Za-z0-9._-]{1,128}$")
+
+# QueryStats of the request being handled. Context variables follow the
+# request into the threads sync_to_async runs database code in, where the
+# connections differ from the ones the middleware itself can see.
+query_stats_var = ContextVar("query_stats", default=None)
+
+
+class RequestIdMiddleware:
+    """
+    Tag each request with an id, taken from a well-formed `X-Request-ID`
+    header or generated, that is attached to every log record emitted while
+    handling it and echoed back in the response.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        request_id = self._request_id(request)
+        token = request_id_var.set(request_id)
+        try:
+            response = self.get_response(request)
+        finally:
+            request_id_var.reset(token)
+        response["X-Request-ID"] = request_id
+        return response
+
+    async def __acall__(self, request):
+        request_id = self._request_id(request)
+        token = request_id_var.set(request_id)
+        try:
+            response = await self.get_response(request)
+        finally:
+            request_id_var.reset(token)
+        response["X-Request-ID"] = request_id
+        return response
+
+    def _request_id(self, request):
+        request_id = request.headers.get("X-Request-ID", "")
+        if REQUEST_ID_PATTERN.match(request_id):
+            return request_id
+        return uuid.uuid4().hex
+
+
+class StaticFilesMiddleware(WhiteNoiseMiddleware):
+    """
+    WhiteNoise, usable in an async middleware chain.
+
+    WhiteNoiseMiddleware is sync only, which would make Django run the whole
+    chain, async views included, in a thread per request under ASGI.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, *args, **kwargs):
+        super().__init__(get_response, *args, **kwargs)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = await sync_to_async(self.find_file)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            # Opens the file, so keep it off the event loop
+            return await sync_to_async(self.serve)(static_file, request)
+        return await self.get_response(request)
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class QueryStats:
+    """Database execute wrapper that counts and times every statement"""
+
+    def __init__(self, keep_slowest=3):
+        self.count = 0
+        self.duration = 0.0
+        self.keep_slowest = keep_slowest
+        self.slowest = []  # min-heap of (duration, sql)
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - start
+            self.count += 1
+            self.duration += duration
+            if len(self.slowest) < self.keep_slowest:
+                heapq.heappush(self.slowest, (duration, sql))
+            elif duration > self.slowest[0][0]:
+                heapq.heapreplace(self.slowest, (duration, sql))
+
+
+def _record_query(execute, sql, params, many, context):
+    stats = query_stats_var.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    return stats(execute, sql, params, many, context)
+
+
+def _install_query_recorder(connection, **kwargs):
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_query)
+
+
+class QueryInstrumentationMiddleware:
+    """
+    Record the number of queries, total database time and slowest statements
+    of every request.
+
+    The numbers are returned in a `Server-Timing` header and logged on the
+    `api.queries` logger. Views can declare a `query_budget`; exceeding it
+    logs a warning, or raises QueryBudgetExceeded when QUERY_BUDGET_STRICT is
+    on (as in tests). Enabled with QUERY_INSTRUMENTATION.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.QUERY_INSTRUMENTATION:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+        # Every connection, in whichever thread it is opened, reports to the
+        # stats of the request in its context
+        connection_created.connect(
+            _install_query_recorder, dispatch_uid="api.query_recorder"
+        )
+        for connection in connections.all(initialized_only=True):
+            _install_query_recorder(connection)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        stats = QueryStats()
+        request._query_budget = None
+        start = time.perf_counter()
+        token = query_stats_var.set(stats)
+        try:
+            for connection in connections.all(initialized_only=True):
+                _install_query_recorder(connection)
+            response = self.get_response(request)
+        finally:
+            query_stats_var.reset(token)
+        return self._report(request, response, stats, start)
+
+    async def __acall__(self, request):
+        stats = QueryStats()
+        request._query_budget = None
+        start = time.perf_counter()
+        token = query_stats_var.set(stats)
+        try:
+            response = await self.get_response(request)
+        finally:
+            query_stats_var.reset(token)
+        return self._report(request, response, stats, start)
+
+    def _report(self, request, response, stats, start):
+        total_ms = (time.perf_counter() - start) * 1000
+        db_ms = stats.duration * 1000
+
+        response["Server-Timing"] = (
+            f'db;dur={db_ms:.1f};desc="{stats.count} queries", '
+            f"total;dur={total_ms:.1f}"
+        )
+
+        if logger.isEnabledFor(logging.INFO):
+            slowest = [
+                {"sql": sql, "ms": round(duration * 1000, 1)}
+                for duration, sql in sorted(stats.slowest, reverse=True)
+                if duration * 1000 >= settings.SLOW_QUERY_MS
+            ]
+            logger.info(
+                "%s %s %s: %d queries in %.1fms",
+                request.method,
+                request.path,
+                response.status_code,
+                stats.count,
+                db_ms,
+                extra={
+                    "method": request.method,
+                    "path": request.path,
+                    "status": response.status_code,
+                    "queries": stats.count,
+                    "db_ms": round(db_ms, 1),
+                    "total_ms": round(total_ms, 1),
+                    "slow_queries": slowest,
+                },
+            )
+
+        budget = request._query_budget
+        if budget is not None and stats.count > budget:
+            message = (
+                f"{request.method} {request.path} issued {stats.count} queries, "
+                f"over its budget of {budget}"
+            )
+            if settings.QUERY_BUDGET_STRICT:
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, "view_class", view_func)
+        request._query_budget = getattr(view_class, "query_budget", None)
@@ -0,0 +1,75 @@
+from django.db import migrations
+
+# Retried webhooks created several Order rows for one checkout session before
+# stripe_session_id was made unique. Each session keeps one row, preferring a
+# paid one and then the most recently updated, which inherits the user and
+# raw line items of its duplicates when it has none. Runs before the
+# migrations that add order_stripe_session_id_uniq, which would otherwise
+# fail on the duplicates.
+MERGE_DUPLICATES = """
+WITH ranked AS (
+    SELECT
+        id,
+        stripe_session_id,
+        ROW_NUMBER() OVER (
+            PARTITION BY stripe_session_id
+            ORDER BY payment_status = 'PAID' DESC, updated_at DESC, id DESC
+        ) AS rank
+    FROM api_order
+),
+merged AS (
+    SELECT
+        stripe_session_id,
+        (ARRAY_AGG(user_id ORDER BY updated_at DESC)
+            FILTER (WHERE user_id IS NOT NULL))[1] AS user_id,
+        (ARRAY_AGG(items ORDER BY updated_at DESC)
+            FILTER (WHERE items <> '[]'::jsonb))[1] AS items
+    FROM api_order
+    GROUP BY stripe_session_id
+    HAVING COUNT(*) > 1
+)
+UPDATE api_order AS o
+SET user_id = COALESCE(o.user_id, merged.user_id),
+    items = CASE WHEN o.items = '[]'::jsonb
+        THEN COALESCE(merged.items, o.items) ELSE o.items END
+FROM ranked, merged
+WHERE ranked.id = o.id
+    AND ranked.rank = 1
+    AND merged.stripe_session_id = o.stripe_session_id
+"""
+
+DELETE_DUPLICATES = """
+DELETE FROM api_order AS o
+USING (
+    SELECT
+        id,
+        ROW_NUMBER() OVER (
+            PARTITION BY stripe_session_id
+            ORDER BY payment_status = 'PAID' DESC, updated_at DESC, id DESC
+        ) AS rank
+    FROM api_order
+) AS ranked
+WHERE ranked.id = o.id AND ranked.rank > 1
+"""
+
+
+def dedupe_orders(apps, schema_editor):
+    connection = schema_editor.connection
+    # Nothing to merge on a fresh database, where the table comes later. The
+    # project runs on PostgreSQL, which the statements are written for.
+    if (
+        connection.vendor != "postgresql"
+        or "api_order" not in connection.introspection.table_names()
+    ):
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(MERGE_DUPLICATES)
+        cursor.execute(DELETE_DUPLICATES)
+
+
+class Migration(migrations.Migration):
+    dependencies = []
+
+    operations = [
+        migrations.RunPython(dedupe_orders, migrations.RunPython.noop),
+    ]
@@ -1,3 +1,8 @@
 from .auth import PasswordResetToken
+from .email import OutboundEmail
 from .job_board import *
+from .job_term import ArchivedJob, JobTerm
+from .price import StripePrice
+from .search import JobSearchDocument
 from .user import CustomUser
+from .webhook import StripeEvent
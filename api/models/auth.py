@@ -1,3 +1,4 @@
+import hashlib
 import uuid
 from datetime import timedelta
 
@@ -8,9 +9,10 @@ from django.utils import timezone
 class PasswordResetToken(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     user = models.ForeignKey("CustomUser", on_delete=models.CASCADE)
-    token = models.CharField(max_length=100, unique=True)
+    # SHA-256 hex digest of the token; the raw token only exists in the email
+    token = models.CharField(max_length=64, unique=True)
     created_at = models.DateTimeField(auto_now_add=True)
-    expires_at = models.DateTimeField()
+    expires_at = models.DateTimeField(db_index=True)
     used = models.BooleanField(default=False)
 
     def save(self, *args, **kwargs):
@@ -18,6 +20,10 @@ class PasswordResetToken(models.Model):
             self.expires_at = timezone.now() + timedelta(hours=24)
         super().save(*args, **kwargs)
 
+    @staticmethod
+    def hash_token(token):
+        return hashlib.sha256(token.encode()).hexdigest()
+
     @property
     def is_valid(self):
         return not self.used and self.expires_at > timezone.now()
@@ -0,0 +1,47 @@
+from django.db import models
+from django.utils import timezone
+
+
+class OutboundEmail(models.Model):
+    class Status(models.TextChoices):
+        PENDING = "PENDING", "Pending"
+        SENT = "SENT", "Sent"
+        FAILED = "FAILED", "Failed"
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    html_body = models.TextField(blank=True)
+    from_email = models.CharField(max_length=255, blank=True)
+    recipients = models.JSONField()  # List of recipient addresses
+    # Pending emails sharing a digest key are coalesced into one message
+    digest_key = models.CharField(max_length=255, blank=True)
+    # The body holds a secret, such as a password reset link, and is cleared
+    # once the email is sent or given up on
+    sensitive = models.BooleanField(default=False)
+    status = models.CharField(
+        max_length=20, choices=Status.choices, default=Status.PENDING
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["status", "next_attempt_at"], name="outbound_email_due_idx"
+            ),
+            models.Index(
+                fields=["digest_key", "status"], name="outbound_email_digest_idx"
+            ),
+            # Sent emails old enough to prune
+            models.Index(
+                fields=["sent_at"],
+                name="outbound_email_sent_idx",
+                condition=models.Q(status="SENT"),
+            ),
+        ]
+
+    def __str__(self):
+        return f"Email {self.id} to {', '.join(self.recipients)} - {self.status}"
@@ -0,0 +1,55 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.utils import timezone
+
+
+class JobTerm(models.Model):
+    """
+    Paid run of a job posting, expired by `manage.py expire_jobs`.
+
+    Kept beside the Job table so the scheduler scans a narrow table through
+    its (status, expires_at) index instead of the jobs themselves.
+    """
+
+    class Status(models.TextChoices):
+        ACTIVE = "ACTIVE", "Active"
+        EXPIRED = "EXPIRED", "Expired"
+
+    job = models.OneToOneField(
+        "api.Job", on_delete=models.CASCADE, primary_key=True, related_name="term"
+    )
+    status = models.CharField(
+        max_length=20, choices=Status.choices, default=Status.ACTIVE
+    )
+    starts_at = models.DateTimeField(default=timezone.now)
+    expires_at = models.DateTimeField()
+    expired_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "expires_at"], name="job_term_due_idx"),
+            # Expired terms old enough to archive
+            models.Index(
+                fields=["expired_at"],
+                name="job_term_expired_idx",
+                condition=models.Q(status="EXPIRED"),
+            ),
+        ]
+
+    def __str__(self):
+        return f"Job {self.job_id} - {self.status} until {self.expires_at}"
+
+
+class ArchivedJob(models.Model):
+    """Snapshot of an expired job moved out of the Job table"""
+
+    job_id = models.BigIntegerField(unique=True)
+    employer_id = models.BigIntegerField(null=True)
+    data = models.JSONField(encoder=DjangoJSONEncoder)  # The job row's values
+    # Values of the job's application rows, deleted along with the job
+    applications = models.JSONField(encoder=DjangoJSONEncoder, default=list)
+    expired_at = models.DateTimeField(null=True)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Archived job {self.job_id}"
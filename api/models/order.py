@@ -16,9 +16,48 @@ class Order(models.Model):
         max_length=20, choices=Status.choices, default="pending"
     )
     amount_total = models.DecimalField(max_digits=10, decimal_places=2)
-    items = models.JSONField()  # Stores line items from Stripe
+    # Raw Stripe line items of older orders, superseded by OrderLineItem
+    items = models.JSONField(default=list, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["stripe_session_id"], name="order_stripe_session_id_uniq"
+            ),
+        ]
+        indexes = [
+            # Order history for a user, newest first
+            models.Index(fields=["user", "-created_at"], name="order_user_created_idx"),
+            # Orders still awaiting payment, kept small by excluding PAID rows
+            models.Index(
+                fields=["payment_status", "created_at"],
+                name="order_unpaid_idx",
+                condition=~models.Q(payment_status="PAID"),
+            ),
+        ]
+
     def __str__(self):
         return f"Order {self.id} - {self.payment_status}"
+
+
+class OrderLineItem(models.Model):
+    # Keyed on the Stripe session so line items can be written in the same
+    # batch as their order upsert, without reading back order ids first
+    order = models.ForeignKey(
+        Order,
+        on_delete=models.CASCADE,
+        to_field="stripe_session_id",
+        related_name="line_items",
+    )
+    stripe_line_item_id = models.CharField(max_length=255, unique=True)
+    price_id = models.CharField(max_length=255)
+    product_id = models.CharField(max_length=255)
+    description = models.CharField(max_length=255, blank=True)
+    quantity = models.PositiveIntegerField()
+    unit_amount = models.DecimalField(max_digits=10, decimal_places=2)
+    currency = models.CharField(max_length=3)
+
+    def __str__(self):
+        return f"{self.quantity} x {self.price_id} ({self.order_id})"
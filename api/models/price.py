@@ -0,0 +1,16 @@
+from django.db import models
+
+
+class StripePrice(models.Model):
+    """Local copy of a Stripe Price, synced by `manage.py sync_stripe_prices`"""
+
+    price_id = models.CharField(max_length=255, unique=True)
+    product_id = models.CharField(max_length=255)
+    product_name = models.CharField(max_length=255, blank=True)
+    unit_amount = models.DecimalField(max_digits=10, decimal_places=2)
+    currency = models.CharField(max_length=3)
+    active = models.BooleanField(default=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.product_name or self.product_id} - {self.unit_amount} {self.currency}"
@@ -0,0 +1,36 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from django.db import models
+
+
+class JobSearchDocument(models.Model):
+    """
+    Full-text search document of a job, maintained by api.utils.search_utils.
+
+    Kept out of the Job table so that indexing never rewrites job rows, and
+    so that only active jobs are in the GIN index.
+    """
+
+    job = models.OneToOneField(
+        "api.Job",
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="search_document",
+    )
+    employer_id = models.BigIntegerField(null=True)
+    is_active = models.BooleanField(default=False)
+    # Weighted title (A), company name (B) and description (C)
+    search_vector = SearchVectorField(null=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            GinIndex(
+                fields=["search_vector"],
+                name="job_search_vector_idx",
+                condition=models.Q(is_active=True),
+            ),
+        ]
+
+    def __str__(self):
+        return f"Search document for job {self.job_id}"
@@ -0,0 +1,37 @@
+from django.db import models
+from django.utils import timezone
+
+
+class StripeEvent(models.Model):
+    class Status(models.TextChoices):
+        PENDING = "PENDING", "Pending"
+        PROCESSED = "PROCESSED", "Processed"
+        FAILED = "FAILED", "Failed"
+
+    event_id = models.CharField(max_length=255, unique=True)
+    type = models.CharField(max_length=100)
+    payload = models.JSONField()  # Raw event body as received from Stripe
+    status = models.CharField(
+        max_length=20, choices=Status.choices, default=Status.PENDING
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    received_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["status", "next_attempt_at"], name="stripe_event_due_idx"
+            ),
+            # Processed events old enough to prune
+            models.Index(
+                fields=["processed_at"],
+                name="stripe_event_processed_idx",
+                condition=models.Q(status="PROCESSED"),
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.type} {self.event_id} - {self.status}"
@@ -0,0 +1,38 @@
+from rest_framework.pagination import CursorPagination
+
+
+class OrderCursorPagination(CursorPagination):
+    """
+    Keyset pagination over (created_at, id), newest first.
+
+    The cursor seeks past the last row seen instead of using OFFSET, so every
+    page costs the same as the first one.
+    """
+
+    ordering = ("-created_at", "-id")
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+
+class JobCursorPagination(CursorPagination):
+    """Keyset pagination over active jobs, newest first"""
+
+    ordering = ("-id",)
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+
+class JobSearchCursorPagination(CursorPagination):
+    """
+    Keyset pagination over search results, best match first.
+
+    The cursor holds the rank of the last result seen; results sharing that
+    rank are told apart by the cursor offset.
+    """
+
+    ordering = ("-rank", "-job_id")
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
@@ -1,6 +1,18 @@
+from django.core.exceptions import ObjectDoesNotExist
 from rest_framework import permissions
 
 
+def _employer_id(user):
+    """
+    Id of the user's employer profile, or None. Reads the profile loaded by
+    CachedJWTAuthentication, so it doesn't query.
+    """
+    try:
+        return user.employer.pk
+    except (AttributeError, ObjectDoesNotExist):
+        return None
+
+
 class IsEmployerOrReadOnly(permissions.BasePermission):
     """
     Custom permission to only allow employers to create or edit jobs.
@@ -12,12 +24,14 @@ class IsEmployerOrReadOnly(permissions.BasePermission):
             return True
 
         # Write permissions are only allowed to employers
-        return hasattr(request.user, "employer")
+        return _employer_id(request.user) is not None
 
     def has_object_permission(self, request, view, obj):
         # Read permissions are allowed to any request
         if request.method in permissions.SAFE_METHODS:
             return True
 
-        # Write permissions are only allowed to the employer who owns the job
-        return obj.employer == request.user.employer
+        # Write permissions are only allowed to the employer who owns the job,
+        # compared by id so the job's employer isn't loaded
+        employer_id = _employer_id(request.user)
+        return employer_id is not None and obj.employer_id == employer_id
@@ -0,0 +1,69 @@
+import math
+from decimal import Decimal
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Types orjson doesn't serialize natively (Decimal, lazy strings, querysets,
+# ...) are converted the same way DRF's encoder does
+_encoder = JSONEncoder()
+
+
+def _has_non_finite(data):
+    """Whether `data` holds a NaN or infinite number anywhere"""
+    if isinstance(data, float):
+        return not math.isfinite(data)
+    if isinstance(data, Decimal):
+        return not data.is_finite()
+    if isinstance(data, dict):
+        return any(_has_non_finite(value) for value in data.values())
+    if isinstance(data, (list, tuple)):
+        return any(_has_non_finite(item) for item in data)
+    return False
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSON renderer backed by orjson, when it is installed.
+
+    UUIDs and datetimes are serialized natively, other types through DRF's
+    encoder, so the output matches JSONRenderer. Indented output, ASCII
+    escaping, data orjson can't encode and non-finite numbers, which
+    JSONRenderer rejects, fall back to JSONRenderer.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None
+            or self.ensure_ascii
+            or self.get_indent(accepted_media_type, renderer_context or {})
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        if data is None:
+            return b""
+
+        try:
+            ret = orjson.dumps(
+                data,
+                default=_encoder.default,
+                option=orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z,
+            )
+        except orjson.JSONEncodeError:
+            # e.g. integers wider than 64 bits, which the json module handles
+            return super().render(data, accepted_media_type, renderer_context)
+        # orjson writes NaN and infinities as null where JSONRenderer raises,
+        # and they can only show up where the output has a null
+        if b"null" in ret and _has_non_finite(data):
+            return super().render(data, accepted_media_type, renderer_context)
+        # Keep the output a strict JavaScript subset, like JSONRenderer
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+                b"\xe2\x80\xa9", b"\\u2029"
+            )
+        return ret
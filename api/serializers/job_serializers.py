@@ -0,0 +1,24 @@
+from rest_framework import serializers
+
+from api.models.job_board import Job
+from api.models.search import JobSearchDocument
+
+
+class JobSerializer(serializers.ModelSerializer):
+    company_name = serializers.CharField(source="employer.company_name")
+
+    class Meta:
+        model = Job
+        fields = ["id", "title", "company_name", "description"]
+
+
+class JobSearchResultSerializer(serializers.ModelSerializer):
+    id = serializers.IntegerField(source="job_id")
+    title = serializers.CharField(source="job.title")
+    company_name = serializers.CharField(source="job.employer.company_name")
+    description = serializers.CharField(source="job.description")
+    rank = serializers.FloatField()
+
+    class Meta:
+        model = JobSearchDocument
+        fields = ["id", "title", "company_name", "description", "rank"]
@@ -1,9 +1,25 @@
 from rest_framework import serializers
 
-from api.models.order import Order
+from api.models.order import Order, OrderLineItem
+from api.models.price import StripePrice
+
+
+class OrderLineItemSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = OrderLineItem
+        fields = [
+            "price_id",
+            "product_id",
+            "description",
+            "quantity",
+            "unit_amount",
+            "currency",
+        ]
 
 
 class OrderSerializer(serializers.ModelSerializer):
+    items = OrderLineItemSerializer(source="line_items", many=True, read_only=True)
+
     class Meta:
         model = Order
         fields = [
@@ -14,3 +30,23 @@ class OrderSerializer(serializers.ModelSerializer):
             "items",
             "created_at",
         ]
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        # Only serialize the requested subset of fields
+        if fields is not None:
+            for field_name in set(self.fields) - set(fields):
+                self.fields.pop(field_name)
+
+
+class StripePriceSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = StripePrice
+        fields = [
+            "price_id",
+            "product_id",
+            "product_name",
+            "unit_amount",
+            "currency",
+        ]
@@ -0,0 +1,45 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from api.authentication import invalidate_cached_user
+from api.models.job_board import Employer, Job, JobSeeker
+from api.models.user import CustomUser
+from api.utils.cache_utils import invalidate_jobs_on_commit
+from api.utils.search_utils import index_jobs_on_commit
+
+
+@receiver(post_save, sender=CustomUser)
+@receiver(post_delete, sender=CustomUser)
+def invalidate_user_cache(sender, instance, **kwargs):
+    # Covers password, is_active and user_type changes made through save()
+    invalidate_cached_user(instance.pk)
+
+
+@receiver(post_save, sender=Employer)
+@receiver(post_delete, sender=Employer)
+@receiver(post_save, sender=JobSeeker)
+@receiver(post_delete, sender=JobSeeker)
+def invalidate_profile_user_cache(sender, instance, **kwargs):
+    # Profiles are cached with their user by CachedJWTAuthentication
+    invalidate_cached_user(instance.user_id)
+
+
+@receiver(post_save, sender=Job)
+def reindex_job(sender, instance, **kwargs):
+    index_jobs_on_commit([instance.pk])
+
+
+@receiver(post_save, sender=Job)
+@receiver(post_delete, sender=Job)
+def invalidate_job_cache(sender, instance, **kwargs):
+    invalidate_jobs_on_commit([instance.pk])
+
+
+@receiver(post_save, sender=Employer)
+def refresh_employer_jobs(sender, instance, created, update_fields=None, **kwargs):
+    # Job search documents and cached payloads include the company name
+    if created or (update_fields is not None and "company_name" not in update_fields):
+        return
+    job_ids = list(Job.objects.filter(employer=instance).values_list("pk", flat=True))
+    index_jobs_on_commit(job_ids)
+    invalidate_jobs_on_commit(job_ids)
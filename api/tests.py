@@ -1,3 +1,210 @@
-from django.test import TestCase
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+from urllib.parse import parse_qs
 
-# Create your tests here.
+import stripe
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from api.models.job_board import Employer, Job
+from api.models.job_term import JobTerm
+from api.models.order import Order
+from api.models.user import CustomUser
+from api.utils.job_utils import expire_jobs
+from api.utils.order_utils import fulfil_checkout_session
+from api.utils.stripe_utils import create_checkout_session
+
+
+def checkout_session(session_id, job, user):
+    return stripe.checkout.Session.construct_from(
+        {
+            "id": session_id,
+            "object": "checkout.session",
+            "customer_email": user.email,
+            "amount_total": 4900,
+            "metadata": {"user_id": str(user.id), "job_id": str(job.id)},
+        },
+        "sk_test",
+    )
+
+
+def line_items(session_id):
+    return [
+        {
+            "id": f"li_{session_id}",
+            "description": "Job posting",
+            "quantity": 1,
+            "currency": "usd",
+            "price": {"id": "price_job", "product": "prod_job", "unit_amount": 4900},
+        }
+    ]
+
+
+class FulfilCheckoutSessionTests(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(
+            email="employer@example.com", password="password", user_type="EM"
+        )
+        employer = Employer.objects.create(user=self.user, company_name="Example")
+        self.job = Job.objects.create(
+            employer=employer, title="Backend Engineer", description="Python"
+        )
+
+    def fulfil(self, session_id):
+        with self.captureOnCommitCallbacks(execute=True):
+            fulfil_checkout_session(
+                checkout_session(session_id, self.job, self.user),
+                line_items(session_id),
+            )
+
+    def test_replayed_session_does_not_revive_expired_job(self):
+        self.fulfil("cs_test_1")
+        JobTerm.objects.filter(job=self.job).update(
+            expires_at=timezone.now() - timedelta(seconds=1)
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            expire_jobs()
+
+        self.fulfil("cs_test_1")
+
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.status, Job.Status.EXPIRED)
+        self.assertEqual(self.job.term.status, JobTerm.Status.EXPIRED)
+        self.assertEqual(Order.objects.filter(stripe_session_id="cs_test_1").count(), 1)
+
+    def test_new_session_restarts_expired_job(self):
+        self.fulfil("cs_test_1")
+        JobTerm.objects.filter(job=self.job).update(
+            expires_at=timezone.now() - timedelta(seconds=1)
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            expire_jobs()
+
+        self.fulfil("cs_test_2")
+
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.status, Job.Status.ACTIVE)
+        self.assertEqual(self.job.term.status, JobTerm.Status.ACTIVE)
+
+
+class OrderQueryPlanTests(TestCase):
+    def test_order_lookups_use_their_indexes(self):
+        # Raises CommandError naming each lookup that misses its index
+        call_command(
+            "check_order_query_plans", orders=100_000, users=100, stdout=StringIO()
+        )
+
+
+class FakeStripeServer(ThreadingHTTPServer):
+    """Local stand-in for the Stripe API that records checkout requests"""
+
+    daemon_threads = True
+
+    def __init__(self, failures=0):
+        super().__init__(("127.0.0.1", 0), FakeStripeHandler)
+        self.failures = failures
+        self.requests = []
+        self.lock = threading.Lock()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_port}"
+
+
+class FakeStripeHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"])).decode()
+        with self.server.lock:
+            self.server.requests.append((self.path, dict(self.headers), body))
+            session_id = f"cs_test_{len(self.server.requests)}"
+            fail = self.server.failures > 0
+            self.server.failures -= fail
+
+        if fail:
+            self._respond(
+                503,
+                {"error": {"type": "api_error", "message": "Try again"}},
+                {"Stripe-Should-Retry": "true"},
+            )
+        else:
+            self._respond(
+                200,
+                {
+                    "id": session_id,
+                    "object": "checkout.session",
+                    "url": f"https://checkout.stripe.com/c/pay/{session_id}",
+                },
+            )
+
+    def _respond(self, status, payload, headers=None):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StripeClientTests(SimpleTestCase):
+    def start_server(self, failures=0):
+        server = FakeStripeServer(failures=failures)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        settings = override_settings(
+            STRIPE_API_BASE=server.url,
+            STRIPE_SECRET_KEY="sk_test_fake",
+            STRIPE_MAX_NETWORK_RETRIES=2,
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+        return server
+
+    def test_checkout_session_is_created_with_an_idempotency_key(self):
+        server = self.start_server()
+
+        session = create_checkout_session("price_job", "user-1", "42")
+
+        self.assertEqual(session.url, "https://checkout.stripe.com/c/pay/cs_test_1")
+        path, headers, body = server.requests[0]
+        self.assertEqual(path, "/v1/checkout/sessions")
+        self.assertTrue(headers["Idempotency-Key"])
+        params = parse_qs(body)
+        self.assertEqual(params["line_items[0][price]"], ["price_job"])
+        self.assertEqual(params["metadata[job_id]"], ["42"])
+
+    def test_retries_reuse_the_idempotency_key(self):
+        server = self.start_server(failures=1)
+
+        session = create_checkout_session("price_job", "user-1", "42")
+
+        self.assertEqual(session.id, "cs_test_2")
+        keys = {headers["Idempotency-Key"] for _, headers, _ in server.requests}
+        self.assertEqual(len(server.requests), 2)
+        self.assertEqual(len(keys), 1)
+
+    def test_concurrent_calls_from_several_threads(self):
+        server = self.start_server()
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            sessions = list(
+                executor.map(
+                    lambda i: create_checkout_session("price_job", f"user-{i}", "42"),
+                    range(32),
+                )
+            )
+
+        self.assertEqual(len({session.id for session in sessions}), 32)
+        self.assertEqual(len(server.requests), 32)
@@ -0,0 +1,150 @@
+import hashlib
+import time
+from functools import lru_cache
+from threading import RLock
+
+from cachetools import TLRUCache
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class LocalCounterStore:
+    """In-process counters, suitable for a single node"""
+
+    def __init__(self, maxsize=100_000):
+        # Values are (count, expires_at); each entry expires on its own
+        self._counters = TLRUCache(
+            maxsize=maxsize, ttu=lambda key, value, now: value[1]
+        )
+        self._lock = RLock()
+
+    def get_many(self, keys):
+        with self._lock:
+            return {
+                key: self._counters[key][0] for key in keys if key in self._counters
+            }
+
+    def incr(self, key, timeout):
+        with self._lock:
+            count, expires_at = self._counters.get(key, (0, time.monotonic() + timeout))
+            self._counters[key] = (count + 1, expires_at)
+
+
+class CacheCounterStore:
+    """
+    Counters in a Django cache, shared by every node using the same backend.
+
+    Point THROTTLE_CACHE_ALIAS at a Redis/Memcached cache, or at a
+    DatabaseCache to keep the counters in the database.
+    """
+
+    def __init__(self, alias):
+        self.cache = caches[alias]
+
+    def get_many(self, keys):
+        return self.cache.get_many(keys)
+
+    def incr(self, key, timeout):
+        self.cache.add(key, 0, timeout)
+        try:
+            self.cache.incr(key)
+        except ValueError:
+            # Expired between add() and incr()
+            self.cache.set(key, 1, timeout)
+
+
+@lru_cache(maxsize=None)
+def get_counter_store():
+    if settings.THROTTLE_COUNTER_STORE == "cache":
+        return CacheCounterStore(settings.THROTTLE_CACHE_ALIAS)
+    return LocalCounterStore()
+
+
+@receiver(setting_changed)
+def reset_counter_store(*, setting, **kwargs):
+    if setting.startswith("THROTTLE_"):
+        get_counter_store.cache_clear()
+
+
+class SlidingWindowThrottle(SimpleRateThrottle):
+    """
+    Sliding window counter throttle.
+
+    Requests are counted in fixed windows, and the count of the previous
+    window is weighted by how much of it still overlaps the sliding window.
+    That approximates a true sliding log with two counters per client.
+    """
+
+    def get_rate(self):
+        # Read the rates on every request so settings overrides take effect
+        return api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        now = self.timer()
+        window, offset = divmod(now, self.duration)
+        current_key = f"{self.key}:{int(window)}"
+        previous_key = f"{self.key}:{int(window) - 1}"
+
+        store = get_counter_store()
+        counts = store.get_many([previous_key, current_key])
+        overlap = 1 - offset / self.duration
+        estimate = counts.get(previous_key, 0) * overlap + counts.get(current_key, 0)
+        if estimate >= self.num_requests:
+            self.wait_seconds = self.duration - offset
+            return False
+
+        store.incr(current_key, self.duration * 2)
+        return True
+
+    def wait(self):
+        return getattr(self, "wait_seconds", None)
+
+
+class IPSlidingWindowThrottle(SlidingWindowThrottle):
+    def get_cache_key(self, request, view):
+        return self.cache_format % {
+            "scope": self.scope,
+            "ident": self.get_ident(request),
+        }
+
+
+class EmailSlidingWindowThrottle(SlidingWindowThrottle):
+    def get_cache_key(self, request, view):
+        data = request.data
+        email = data.get("email") if hasattr(data, "get") else None
+        if not isinstance(email, str) or not email:
+            return None
+        # Hashed to keep arbitrary input out of cache keys
+        ident = hashlib.sha256(email.strip().lower().encode()).hexdigest()
+        return self.cache_format % {"scope": self.scope, "ident": ident}
+
+
+class LoginIPThrottle(IPSlidingWindowThrottle):
+    scope = "login_ip"
+
+
+class LoginEmailThrottle(EmailSlidingWindowThrottle):
+    scope = "login_email"
+
+
+class PasswordResetIPThrottle(IPSlidingWindowThrottle):
+    scope = "password_reset_ip"
+
+
+class PasswordResetEmailThrottle(EmailSlidingWindowThrottle):
+    scope = "password_reset_email"
+
+
+class RegisterIPThrottle(IPSlidingWindowThrottle):
+    scope = "register_ip"
@@ -0,0 +1,186 @@
+import hashlib
+import math
+import time
+from collections import deque
+from datetime import timedelta
+from threading import RLock, Thread
+
+from django.conf import settings
+from django.db import connections
+from django.utils import timezone
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+from rest_framework_simplejwt.tokens import RefreshToken
+
+# Blacklist rows are re-read for this long after they could have been
+# assigned an id, so rows committed out of id order are not missed
+SYNC_LOOKBACK = 10  # seconds
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings"""
+
+    def __init__(self, capacity, error_rate):
+        self.capacity = capacity
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def add(self, item):
+        positions = self._positions(item)
+        if all(self.bits[p >> 3] & (1 << (p & 7)) for p in positions):
+            return
+        for position in positions:
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item):
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+
+class TokenBlacklistFilter:
+    """
+    Per-process Bloom filter of blacklisted refresh token jtis.
+
+    A negative answer is trusted, a positive one must be confirmed against the
+    database. The filter is rebuilt from the non-expired blacklist every
+    JWT_BLACKLIST_REBUILD_INTERVAL seconds and picks up tokens blacklisted by
+    other processes with an incremental primary key scan at most every
+    JWT_BLACKLIST_SYNC_INTERVAL seconds, so its cost does not grow with the
+    size of the blacklist tables.
+
+    Rebuilds scan the whole blacklist, so they run in a background thread and
+    swap the new filter in when done; requests keep using the old one, or the
+    database until the first filter is ready.
+    """
+
+    def __init__(self):
+        self._lock = RLock()
+        self._filter = None
+        self._built_at = 0.0
+        self._synced_at = 0.0
+        # (monotonic time, highest blacklist id seen) of recent syncs
+        self._history = deque()
+        self._rebuilding = False
+        # Tokens blacklisted here while a rebuild is running, which its scan
+        # may have missed
+        self._added_during_rebuild = []
+
+    def _build(self):
+        started_at = time.monotonic()
+        now = timezone.now()
+        lookback_cutoff = now - timedelta(seconds=SYNC_LOOKBACK)
+        rows = BlacklistedToken.objects.filter(token__expires_at__gt=now).values_list(
+            "id", "token__jti", "blacklisted_at"
+        )
+        jtis = []
+        lookback_id = 0
+        for pk, jti, blacklisted_at in rows.iterator(chunk_size=10000):
+            jtis.append(jti)
+            if blacklisted_at <= lookback_cutoff:
+                lookback_id = max(lookback_id, pk)
+
+        bloom = BloomFilter(
+            max(settings.JWT_BLACKLIST_FILTER_CAPACITY, len(jtis) * 2),
+            settings.JWT_BLACKLIST_FILTER_ERROR_RATE,
+        )
+        for jti in jtis:
+            bloom.add(jti)
+        return bloom, started_at, lookback_id
+
+    def _rebuild(self):
+        try:
+            bloom, started_at, lookback_id = self._build()
+            with self._lock:
+                for jti in self._added_during_rebuild:
+                    bloom.add(jti)
+                self._filter = bloom
+                # Syncs resume from the scan's start, covering rows committed
+                # while it ran
+                self._built_at = self._synced_at = started_at
+                self._history = deque([(started_at, lookback_id)])
+        finally:
+            with self._lock:
+                self._rebuilding = False
+                self._added_during_rebuild = []
+            connections.close_all()
+
+    def _start_rebuild(self):
+        if self._rebuilding:
+            return
+        self._rebuilding = True
+        Thread(
+            target=self._rebuild, name="token-blacklist-rebuild", daemon=True
+        ).start()
+
+    def _sync(self):
+        now = time.monotonic()
+        if now - self._built_at >= settings.JWT_BLACKLIST_REBUILD_INTERVAL:
+            self._start_rebuild()
+        if now - self._synced_at < settings.JWT_BLACKLIST_SYNC_INTERVAL:
+            return
+
+        # Resume from the newest sync that is at least SYNC_LOOKBACK old
+        while len(self._history) > 1 and now - self._history[1][0] >= SYNC_LOOKBACK:
+            self._history.popleft()
+        since_id = self._history[0][1]
+
+        max_id = since_id
+        rows = BlacklistedToken.objects.filter(id__gt=since_id).values_list(
+            "id", "token__jti"
+        )
+        for pk, jti in rows:
+            self._filter.add(jti)
+            max_id = max(max_id, pk)
+
+        self._history.append((now, max_id))
+        self._synced_at = now
+        if self._filter.count > self._filter.capacity:
+            # Too full for the target error rate, start over with more room
+            self._start_rebuild()
+
+    def might_contain(self, jti):
+        with self._lock:
+            if self._filter is None:
+                self._start_rebuild()
+                return True
+            self._sync()
+            return jti in self._filter
+
+    def add(self, jti):
+        with self._lock:
+            if self._filter is not None:
+                self._filter.add(jti)
+            if self._rebuilding:
+                self._added_during_rebuild.append(jti)
+
+
+blacklist_filter = TokenBlacklistFilter()
+
+
+class FilteredRefreshToken(RefreshToken):
+    """Refresh token that checks the blacklist through `blacklist_filter`"""
+
+    def check_blacklist(self):
+        if blacklist_filter.might_contain(self.payload[api_settings.JTI_CLAIM]):
+            super().check_blacklist()
+
+    def blacklist(self):
+        result = super().blacklist()
+        blacklist_filter.add(self.payload[api_settings.JTI_CLAIM])
+        return result
+
+
+class FilteredTokenRefreshSerializer(TokenRefreshSerializer):
+    token_class = FilteredRefreshToken
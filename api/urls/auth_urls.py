@@ -1,6 +1,13 @@
+from django.conf import settings
 from django.urls import path
 
-from api.views import CustomTokenRefreshView, LoginView, LogoutView, RegisterView
+from api.views import (
+    CustomTokenRefreshView,
+    LoginView,
+    LogoutView,
+    RegisterView,
+    async_views,
+)
 from api.views.auth_views import (
     ChangePasswordView,
     GoogleLoginView,
@@ -15,7 +22,15 @@ urlpatterns = [
     path("logout/", LogoutView.as_view(), name="logout"),
     path("token/refresh/", CustomTokenRefreshView.as_view(), name="token_refresh"),
     path("password/change/", ChangePasswordView.as_view(), name="change-password"),
-    path("password/reset/", ResetPasswordEmailView.as_view(), name="reset-password"),
+    path(
+        "password/reset/",
+        (
+            async_views.reset_password_email
+            if settings.ASYNC_VIEWS
+            else ResetPasswordEmailView.as_view()
+        ),
+        name="reset-password",
+    ),
     path(
         "password/reset/confirm/",
         ResetPasswordConfirmView.as_view(),
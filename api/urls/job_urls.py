@@ -0,0 +1,10 @@
+from django.urls import path
+
+from api.views.job_views import JobCacheStats, JobDetail, JobList, JobSearch
+
+urlpatterns = [
+    path("jobs/", JobList.as_view(), name="job-list"),
+    path("jobs/<int:pk>/", JobDetail.as_view(), name="job-detail"),
+    path("jobs/cache-stats/", JobCacheStats.as_view(), name="job-cache-stats"),
+    path("jobs/search/", JobSearch.as_view(), name="job-search"),
+]
@@ -1,9 +1,24 @@
+from django.conf import settings
 from django.urls import path
 
-from api.views.order_views import CreateCheckoutSession, OrderList, StripeWebhook
+from api.views import async_views
+from api.views.order_views import (
+    CreateCheckoutSession,
+    OrderList,
+    PriceList,
+    StripeWebhook,
+)
 
 urlpatterns = [
-    path("create-checkout-session/", CreateCheckoutSession.as_view()),
+    path(
+        "create-checkout-session/",
+        (
+            async_views.create_checkout_session
+            if settings.ASYNC_VIEWS
+            else CreateCheckoutSession.as_view()
+        ),
+    ),
+    path("prices/", PriceList.as_view()),
     path("orders/", OrderList.as_view()),
     path("webhook/", StripeWebhook.as_view()),
 ]
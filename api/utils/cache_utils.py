@@ -0,0 +1,154 @@
+import hashlib
+import time
+from collections import Counter
+from threading import RLock
+
+from cachetools import TTLCache
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+
+_MISSING = object()
+
+
+class TwoTierCache:
+    """
+    Read-through cache with an in-process LRU in front of a Django cache.
+
+    The local tier saves the network round trip for hot keys; its short TTL
+    bounds how long another process's invalidation can go unseen, provided
+    the shared tier really is shared, so a per-process LocMemCache is refused
+    outside DEBUG. Hits and misses of each tier are counted for monitoring.
+    """
+
+    def __init__(self, prefix, alias, ttl, local_ttl, local_maxsize):
+        backend = settings.CACHES[alias]["BACKEND"]
+        if backend.endswith(".LocMemCache") and not settings.DEBUG:
+            raise ImproperlyConfigured(
+                f"The {alias!r} cache is local to each process, so job cache "
+                "invalidations would not reach other processes"
+            )
+        self.prefix = prefix
+        self.alias = alias
+        self.ttl = ttl
+        self._local = TTLCache(maxsize=local_maxsize, ttl=local_ttl)
+        self._lock = RLock()
+        self._counters = Counter()
+
+    @property
+    def shared(self):
+        return caches[self.alias]
+
+    def _key(self, key):
+        return f"{self.prefix}:{key}"
+
+    def _count(self, name):
+        with self._lock:
+            self._counters[name] += 1
+
+    def get_or_set(self, key, compute):
+        """Return the cached value of `key`, computing and storing it on a miss"""
+        key = self._key(key)
+        with self._lock:
+            value = self._local.get(key, _MISSING)
+        if value is not _MISSING:
+            self._count("local_hits")
+            return value
+
+        value = self.shared.get(key, _MISSING)
+        if value is not _MISSING:
+            self._count("shared_hits")
+        else:
+            self._count("misses")
+            value = compute()
+            self.shared.set(key, value, self.ttl)
+
+        with self._lock:
+            self._local[key] = value
+        return value
+
+    def get_raw(self, key, default=None):
+        """
+        Read a value stored with `set_raw`, e.g. a version number, through
+        the local tier, so it costs a shared tier round trip at most once
+        per local TTL.
+        """
+        key = self._key(key)
+        with self._lock:
+            value = self._local.get(key, _MISSING)
+        if value is _MISSING:
+            value = self.shared.get(key, _MISSING)
+            if value is _MISSING:
+                return default
+            with self._lock:
+                self._local[key] = value
+        return value
+
+    def set_raw(self, key, value):
+        key = self._key(key)
+        self.shared.set(key, value, None)
+        with self._lock:
+            self._local[key] = value
+
+    def delete_many(self, keys):
+        keys = [self._key(key) for key in keys]
+        with self._lock:
+            for key in keys:
+                self._local.pop(key, None)
+        self.shared.delete_many(keys)
+        self._count("invalidations")
+
+    def stats(self):
+        with self._lock:
+            stats = {
+                name: self._counters[name]
+                for name in ("local_hits", "shared_hits", "misses", "invalidations")
+            }
+            stats["local_size"] = len(self._local)
+        hits = stats["local_hits"] + stats["shared_hits"]
+        lookups = hits + stats["misses"]
+        stats["hit_ratio"] = round(hits / lookups, 4) if lookups else None
+        return stats
+
+
+job_cache = TwoTierCache(
+    "jobs",
+    alias=settings.JOB_CACHE_ALIAS,
+    ttl=settings.JOB_CACHE_TTL,
+    local_ttl=settings.JOB_CACHE_LOCAL_TTL,
+    local_maxsize=settings.JOB_CACHE_LOCAL_SIZE,
+)
+
+# Listing pages can't be enumerated for deletion, so their keys embed a
+# version that any job change replaces
+_LISTING_VERSION_KEY = "listing-version"
+
+
+def cached_job_listing(request, compute):
+    """Serialized job listing page for `request`, keyed by its full URL"""
+    version = job_cache.get_raw(_LISTING_VERSION_KEY)
+    if version is None:
+        # Never fall back to a fixed version, whose pages may be stale
+        version = time.time_ns()
+        job_cache.set_raw(_LISTING_VERSION_KEY, version)
+    url = hashlib.sha256(request.build_absolute_uri().encode()).hexdigest()
+    return job_cache.get_or_set(f"list:{version}:{url}", compute)
+
+
+def cached_job_detail(job_id, compute):
+    """Serialized detail payload of one job"""
+    return job_cache.get_or_set(f"detail:{job_id}", compute)
+
+
+def invalidate_jobs(job_ids):
+    """Drop the detail payloads of `job_ids` and every listing page"""
+    job_cache.set_raw(_LISTING_VERSION_KEY, time.time_ns())
+    job_cache.delete_many(f"detail:{job_id}" for job_id in job_ids)
+
+
+def invalidate_jobs_on_commit(job_ids):
+    """Invalidate cached jobs once the current transaction commits"""
+    job_ids = list(job_ids)
+    if job_ids:
+        transaction.on_commit(lambda: invalidate_jobs(job_ids))
@@ -0,0 +1,13 @@
+from django.template.loader import get_template
+
+
+def render_email(name, context):
+    """
+    Render the plain text and HTML variants of `emails/<name>` from one context.
+
+    Compiled templates are already reused across renders by Django's cached
+    template loader, which is enabled by default.
+    """
+    plain_message = get_template(f"emails/{name}.txt").render(context)
+    html_message = get_template(f"emails/{name}.html").render(context)
+    return plain_message, html_message
@@ -1,8 +1,61 @@
-from datetime import datetime
+import smtplib
+from datetime import datetime, timedelta
 
 from django.conf import settings
-from django.core.mail import send_mail
-from django.template.loader import render_to_string
+from django.core.mail import EmailMultiAlternatives
+from django.db import transaction
+from django.utils import timezone
+
+from api.models.email import OutboundEmail
+from api.utils.email_rendering import render_email
+from api.utils.queue_utils import delete_in_batches, retry_delay
+
+
+def _outbound_email(
+    subject,
+    message,
+    recipient_list,
+    html_message=None,
+    from_email=None,
+    digest_key="",
+    delay=None,
+    sensitive=False,
+):
+    next_attempt_at = timezone.now()
+    if delay:
+        next_attempt_at += delay
+    return OutboundEmail(
+        subject=subject,
+        body=message,
+        html_body=html_message or "",
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL or "",
+        recipients=list(recipient_list),
+        digest_key=digest_key,
+        sensitive=sensitive,
+        next_attempt_at=next_attempt_at,
+    )
+
+
+def queue_email(*args, **kwargs):
+    """
+    Persist an email to the outbound queue for delivery by the mail worker.
+
+    Takes the arguments of `send_mail`, plus `digest_key`, `delay` and
+    `sensitive`: emails queued with the same `digest_key` are coalesced into
+    one message, `delay` holds the email back so later ones can join the
+    digest, and `sensitive` clears the stored body once the email is sent or
+    has failed for good, for messages carrying secrets like reset links.
+    """
+    email = _outbound_email(*args, **kwargs)
+    email.save()
+    return email
+
+
+async def aqueue_email(*args, **kwargs):
+    """Async version of `queue_email`, for use from async views"""
+    email = _outbound_email(*args, **kwargs)
+    await email.asave()
+    return email
 
 
 def send_application_confirmation_email(application):
@@ -16,16 +69,14 @@ def send_application_confirmation_email(application):
         "application_date": datetime.now().strftime("%B %d, %Y"),
     }
 
-    html_message = render_to_string("emails/application_confirmation.html", context)
-    plain_message = render_to_string("emails/application_confirmation.txt", context)
+    plain_message, html_message = render_email("application_confirmation", context)
 
-    send_mail(
+    queue_email(
         subject=subject,
         message=plain_message,
         html_message=html_message,
         from_email=settings.DEFAULT_FROM_EMAIL,
         recipient_list=[application.applicant.user.email],
-        fail_silently=False,
     )
 
 
@@ -41,14 +92,158 @@ def send_employer_notification_email(application):
         "cover_letter": application.cover_letter,
     }
 
-    html_message = render_to_string("emails/employer_notification.html", context)
-    plain_message = render_to_string("emails/employer_notification.txt", context)
+    plain_message, html_message = render_email("employer_notification", context)
 
-    send_mail(
+    employer_email = application.job.employer.user.email
+    queue_email(
         subject=subject,
         message=plain_message,
         html_message=html_message,
         from_email=settings.DEFAULT_FROM_EMAIL,
-        recipient_list=[application.job.employer.user.email],
-        fail_silently=False,
+        recipient_list=[employer_email],
+        digest_key=f"employer-applications:{employer_email}",
+        delay=timedelta(seconds=settings.EMAIL_DIGEST_WINDOW),
+    )
+
+
+def _build_message(emails, connection):
+    """Build a single message from one queued email, or a digest of several"""
+    first = emails[0]
+    if len(emails) == 1:
+        subject, body, html_body = first.subject, first.body, first.html_body
+    else:
+        subject = f"{first.subject} (+{len(emails) - 1} more)"
+        body = "\n\n----------\n\n".join(email.body for email in emails)
+        html_body = "<hr>".join(email.html_body for email in emails if email.html_body)
+
+    message = EmailMultiAlternatives(
+        subject=subject,
+        body=body,
+        from_email=first.from_email or None,
+        to=first.recipients,
+        connection=connection,
+    )
+    if html_body:
+        message.attach_alternative(html_body, "text/html")
+    return message
+
+
+def _group_emails(emails):
+    """Group emails so that each digest key maps to a single outgoing message"""
+    groups = {}
+    for email in emails:
+        groups.setdefault(email.digest_key or email.pk, []).append(email)
+    return list(groups.values())
+
+
+def _redact(email):
+    if email.sensitive:
+        email.body = email.html_body = ""
+
+
+def _is_connection_error(error):
+    """Whether `error` means the SMTP session is unusable, not just this message"""
+    session_errors = (
+        smtplib.SMTPServerDisconnected,
+        smtplib.SMTPConnectError,
+        smtplib.SMTPHeloError,
+        smtplib.SMTPAuthenticationError,
+    )
+    if isinstance(error, session_errors):
+        return True
+    return isinstance(error, OSError) and not isinstance(error, smtplib.SMTPException)
+
+
+def _record_failure(email, error):
+    email.attempts += 1
+    email.last_error = str(error)
+    if email.attempts >= settings.EMAIL_QUEUE_MAX_ATTEMPTS:
+        email.status = OutboundEmail.Status.FAILED
+        _redact(email)
+    else:
+        email.next_attempt_at = timezone.now() + retry_delay(
+            email.attempts, settings.EMAIL_QUEUE_RETRY_DELAY
+        )
+
+
+def deliver_queued_emails(connection, batch_size=50):
+    """
+    Deliver one batch of due emails over an already opened connection.
+
+    Rows are locked with SKIP LOCKED so several workers can drain the queue
+    concurrently; a worker that dies mid-batch rolls back and leaves its rows
+    pending. Due emails pull in every other pending email with the same
+    digest key. Messages go out one at a time so a refused message only
+    fails its own emails; if the connection itself drops, the message being
+    sent is retried later and the rest of the batch is left pending.
+    Returns a `(sent, failed)` tuple counting queued emails.
+    """
+    sent = failed = 0
+    with transaction.atomic():
+        pending = OutboundEmail.objects.select_for_update(skip_locked=True).filter(
+            status=OutboundEmail.Status.PENDING
+        )
+        emails = list(
+            pending.filter(next_attempt_at__lte=timezone.now()).order_by(
+                "next_attempt_at"
+            )[:batch_size]
+        )
+        digest_keys = {email.digest_key for email in emails if email.digest_key}
+        if digest_keys:
+            emails += pending.filter(digest_key__in=digest_keys).exclude(
+                pk__in=[email.pk for email in emails]
+            )
+        if not emails:
+            return sent, failed
+
+        updated = []
+        for group in _group_emails(emails):
+            try:
+                connection.send_messages([_build_message(group, connection)])
+            except Exception as e:
+                for email in group:
+                    _record_failure(email, e)
+                failed += len(group)
+                updated += group
+                if _is_connection_error(e):
+                    # Whether it got through is unknown; reconnect next batch
+                    connection.close()
+                    break
+                continue
+
+            for email in group:
+                email.attempts += 1
+                email.status = OutboundEmail.Status.SENT
+                email.sent_at = timezone.now()
+                email.last_error = ""
+                _redact(email)
+            sent += len(group)
+            updated += group
+
+        OutboundEmail.objects.bulk_update(
+            updated,
+            [
+                "status",
+                "attempts",
+                "last_error",
+                "next_attempt_at",
+                "sent_at",
+                "body",
+                "html_body",
+            ],
+        )
+    return sent, failed
+
+
+def prune_sent_emails(batch_size=5000):
+    """
+    Delete emails sent over EMAIL_QUEUE_RETENTION_DAYS ago, in batches.
+    Returns the number of emails deleted.
+    """
+    cutoff = timezone.now() - timedelta(days=settings.EMAIL_QUEUE_RETENTION_DAYS)
+    return delete_in_batches(
+        OutboundEmail.objects.filter(
+            status=OutboundEmail.Status.SENT, sent_at__lt=cutoff
+        ),
+        batch_size,
     )
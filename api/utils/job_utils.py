@@ -0,0 +1,132 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from api.models.job_board import Application, Job
+from api.models.job_term import ArchivedJob, JobTerm
+from api.utils.cache_utils import invalidate_jobs_on_commit
+from api.utils.search_utils import index_jobs_on_commit
+
+
+def start_job_terms(job_ids):
+    """
+    Start a JOB_POSTING_DURATION_DAYS term for each newly paid job.
+
+    Upserted in one INSERT ... ON CONFLICT, so paying again for a job with a
+    new checkout session restarts its term. Replayed sessions never get
+    here, see `fulfil_checkout_sessions`.
+    """
+    now = timezone.now()
+    expires_at = now + timedelta(days=settings.JOB_POSTING_DURATION_DAYS)
+    # Session metadata may name jobs that no longer exist
+    job_ids = Job.objects.filter(pk__in=job_ids).values_list("pk", flat=True)
+    JobTerm.objects.bulk_create(
+        [
+            JobTerm(job_id=job_id, starts_at=now, expires_at=expires_at)
+            for job_id in job_ids
+        ],
+        update_conflicts=True,
+        unique_fields=["job"],
+        update_fields=["status", "starts_at", "expires_at", "expired_at"],
+    )
+
+
+def backfill_job_terms(batch_size=1000):
+    """
+    Start a term for one batch of active jobs that have none, such as jobs
+    paid for before terms were tracked, so they expire like any other.
+
+    They get a full JOB_POSTING_DURATION_DAYS from now rather than being
+    expired on the spot. Returns the number of terms started.
+    """
+    now = timezone.now()
+    expires_at = now + timedelta(days=settings.JOB_POSTING_DURATION_DAYS)
+    job_ids = list(
+        Job.objects.filter(status=Job.Status.ACTIVE, term__isnull=True)
+        .order_by("pk")
+        .values_list("pk", flat=True)[:batch_size]
+    )
+    # A term started by a concurrent payment wins
+    JobTerm.objects.bulk_create(
+        [
+            JobTerm(job_id=job_id, starts_at=now, expires_at=expires_at)
+            for job_id in job_ids
+        ],
+        ignore_conflicts=True,
+    )
+    return len(job_ids)
+
+
+def expire_jobs(batch_size=1000):
+    """
+    Expire one batch of active jobs past the end of their term.
+
+    Due terms are claimed through the (status, expires_at) index, skipping
+    rows locked by a concurrent run, and flipped with one UPDATE each on the
+    terms and the jobs. Returns the number of jobs expired.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        job_ids = list(
+            JobTerm.objects.select_for_update(skip_locked=True)
+            .filter(status=JobTerm.Status.ACTIVE, expires_at__lte=now)
+            .order_by("expires_at")
+            .values_list("job_id", flat=True)[:batch_size]
+        )
+        if not job_ids:
+            return 0
+
+        JobTerm.objects.filter(pk__in=job_ids).update(
+            status=JobTerm.Status.EXPIRED, expired_at=now
+        )
+        Job.objects.filter(pk__in=job_ids, status=Job.Status.ACTIVE).update(
+            status=Job.Status.EXPIRED
+        )
+        # update() skips post_save, so refresh search and the job cache
+        # explicitly
+        index_jobs_on_commit(job_ids)
+        invalidate_jobs_on_commit(job_ids)
+    return len(job_ids)
+
+
+def archive_jobs(batch_size=1000):
+    """
+    Move one batch of jobs expired over JOB_ARCHIVE_AFTER_DAYS ago, with
+    their applications, into ArchivedJob and delete them from the Job table.
+    Returns the number of jobs archived.
+    """
+    cutoff = timezone.now() - timedelta(days=settings.JOB_ARCHIVE_AFTER_DAYS)
+    with transaction.atomic():
+        terms = list(
+            JobTerm.objects.select_for_update(skip_locked=True)
+            .filter(status=JobTerm.Status.EXPIRED, expired_at__lte=cutoff)
+            .order_by("expired_at")
+            .values_list("job_id", "expired_at")[:batch_size]
+        )
+        if not terms:
+            return 0
+
+        expired_at = dict(terms)
+        # Deleting a job cascades to its applications, so keep them too
+        applications = {}
+        for application in Application.objects.filter(job_id__in=expired_at).values():
+            applications.setdefault(application["job_id"], []).append(application)
+        ArchivedJob.objects.bulk_create(
+            [
+                ArchivedJob(
+                    job_id=job["id"],
+                    employer_id=job.get("employer_id"),
+                    data=job,
+                    applications=applications.get(job["id"], []),
+                    expired_at=expired_at[job["id"]],
+                )
+                for job in Job.objects.filter(pk__in=expired_at).values()
+            ],
+            ignore_conflicts=True,
+        )
+        # Cascades to the term, search document and applications of each job
+        Job.objects.filter(pk__in=expired_at).delete()
+        invalidate_jobs_on_commit(expired_at)
+    return len(terms)
@@ -0,0 +1,102 @@
+from django.db import transaction
+
+from api.models.job_board import Job
+from api.models.order import Order, OrderLineItem
+from api.utils.cache_utils import invalidate_jobs_on_commit
+from api.utils.job_utils import start_job_terms
+from api.utils.search_utils import index_jobs_on_commit
+
+ORDER_UPDATE_FIELDS = [
+    "user",
+    "email",
+    "payment_status",
+    "amount_total",
+    "updated_at",
+]
+
+
+def _order_from_session(session):
+    return Order(
+        user_id=session.metadata.get("user_id"),
+        email=session.customer_email,
+        stripe_session_id=session.id,
+        payment_status=Order.Status.PAID,
+        amount_total=session.amount_total / 100,
+    )
+
+
+def build_line_items(stripe_session_id, line_items):
+    """Convert Stripe line item objects (or their JSON) into OrderLineItem rows"""
+    rows = []
+    for item in line_items:
+        price = item["price"]
+        product = price["product"]
+        rows.append(
+            OrderLineItem(
+                order_id=stripe_session_id,
+                stripe_line_item_id=item["id"],
+                price_id=price["id"],
+                product_id=product if isinstance(product, str) else product["id"],
+                description=item.get("description") or "",
+                quantity=item["quantity"],
+                unit_amount=(price.get("unit_amount") or 0) / 100,
+                currency=item["currency"],
+            )
+        )
+    return rows
+
+
+def fulfil_checkout_sessions(sessions):
+    """
+    Record orders for completed checkout sessions and activate their jobs.
+
+    `sessions` is a list of `(session, line_items)` pairs. All orders are
+    upserted on `stripe_session_id` in one INSERT ... ON CONFLICT, their line
+    items inserted in one more, and the jobs are activated with one UPDATE,
+    inside a single transaction. Only sessions without a paid order yet
+    activate their job and start its term, so replaying sessions that were
+    already fulfilled is harmless and never revives an expired job.
+    """
+    orders = [_order_from_session(session) for session, _ in sessions]
+    line_items = [
+        row
+        for session, items in sessions
+        for row in build_line_items(session.id, items)
+    ]
+
+    with transaction.atomic():
+        fulfilled = set(
+            Order.objects.filter(
+                stripe_session_id__in=[order.stripe_session_id for order in orders],
+                payment_status=Order.Status.PAID,
+            ).values_list("stripe_session_id", flat=True)
+        )
+        job_ids = {
+            session.metadata.get("job_id")
+            for session, _ in sessions
+            if session.id not in fulfilled
+        }
+        job_ids.discard(None)
+        job_ids.discard("")
+
+        Order.objects.bulk_create(
+            orders,
+            update_conflicts=True,
+            unique_fields=["stripe_session_id"],
+            update_fields=ORDER_UPDATE_FIELDS,
+        )
+        OrderLineItem.objects.bulk_create(line_items, ignore_conflicts=True)
+        if job_ids:
+            Job.objects.filter(id__in=job_ids).update(status=Job.Status.ACTIVE)
+            # update() skips post_save, so refresh search and the job cache
+            # explicitly
+            index_jobs_on_commit(job_ids)
+            invalidate_jobs_on_commit(job_ids)
+            start_job_terms(job_ids)
+
+    return orders
+
+
+def fulfil_checkout_session(session, line_items):
+    """Record the order for a completed checkout session and activate its job"""
+    return fulfil_checkout_sessions([(session, line_items)])[0]
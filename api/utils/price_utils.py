@@ -0,0 +1,43 @@
+from decimal import Decimal, InvalidOperation
+from threading import RLock
+
+from cachetools import TTLCache, cached
+from django.conf import settings
+
+from api.models.price import StripePrice
+
+
+@cached(cache=TTLCache(maxsize=1, ttl=settings.PRICE_CACHE_TTL), lock=RLock())
+def get_active_prices():
+    """Active prices keyed by Stripe price id, cached per process"""
+    return {
+        price.price_id: price
+        for price in StripePrice.objects.filter(active=True).order_by("unit_amount")
+    }
+
+
+def validate_price(price_id, amount=None):
+    """
+    Check a client-supplied price against the local catalog.
+
+    Returns an error message, or None when the price is active and, if an
+    expected `amount` was given, still costs that amount. An empty catalog,
+    e.g. before the first `sync_stripe_prices`, lets every price through to
+    Stripe rather than rejecting all checkouts.
+    """
+    prices = get_active_prices()
+    if not prices:
+        return None
+
+    price = prices.get(price_id)
+    if price is None:
+        return "Unknown or inactive price"
+
+    if amount is not None:
+        try:
+            if Decimal(str(amount)) != price.unit_amount:
+                return "Price amount has changed"
+        except InvalidOperation:
+            return "Invalid amount"
+
+    return None
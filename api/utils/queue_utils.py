@@ -0,0 +1,29 @@
+import random
+from datetime import timedelta
+
+# Helpers shared by the database-backed queues: the outbound email queue and
+# the Stripe webhook inbox
+
+
+def retry_delay(attempts, base):
+    """
+    Exponential backoff with jitter for an item that failed `attempts` times,
+    starting from `base` seconds
+    """
+    return timedelta(seconds=base * 2 ** (attempts - 1) + random.uniform(0, base))
+
+
+def delete_in_batches(queryset, batch_size):
+    """
+    Delete the rows of `queryset` in primary key order, `batch_size` at a
+    time so no single statement holds locks for long. Returns the number of
+    rows deleted.
+    """
+    total = 0
+    while True:
+        ids = list(queryset.order_by("pk").values_list("pk", flat=True)[:batch_size])
+        if not ids:
+            return total
+
+        queryset.model.objects.filter(pk__in=ids).delete()
+        total += len(ids)
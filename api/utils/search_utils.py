@@ -0,0 +1,78 @@
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import transaction
+from django.db.models import F, Value
+from django.db.models.functions import Coalesce
+
+from api.models.job_board import Job
+from api.models.search import JobSearchDocument
+
+DOCUMENT_UPDATE_FIELDS = ["employer_id", "is_active", "search_vector", "updated_at"]
+
+
+def _job_vector():
+    config = settings.JOB_SEARCH_CONFIG
+    return (
+        SearchVector(Coalesce("title", Value("")), weight="A", config=config)
+        + SearchVector(
+            Coalesce("employer__company_name", Value("")), weight="B", config=config
+        )
+        + SearchVector(Coalesce("description", Value("")), weight="C", config=config)
+    )
+
+
+def index_jobs(job_ids):
+    """
+    Upsert the search documents of the given jobs.
+
+    The vectors are computed by Postgres in one SELECT and written back in one
+    INSERT ... ON CONFLICT, so reindexing costs two queries per batch however
+    many jobs it holds.
+    """
+    rows = (
+        Job.objects.filter(pk__in=job_ids)
+        .annotate(vector=_job_vector())
+        .values_list("pk", "employer_id", "status", "vector")
+    )
+    documents = [
+        JobSearchDocument(
+            job_id=pk,
+            employer_id=employer_id,
+            is_active=status == Job.Status.ACTIVE,
+            search_vector=vector,
+        )
+        for pk, employer_id, status, vector in rows
+    ]
+    JobSearchDocument.objects.bulk_create(
+        documents,
+        update_conflicts=True,
+        unique_fields=["job"],
+        update_fields=DOCUMENT_UPDATE_FIELDS,
+    )
+    return len(documents)
+
+
+def index_jobs_on_commit(job_ids):
+    """Reindex jobs once the current transaction commits"""
+    job_ids = list(job_ids)
+    if job_ids:
+        transaction.on_commit(lambda: index_jobs(job_ids))
+
+
+def search_jobs(query, employer_id=None):
+    """
+    Active jobs matching a web-search style `query`, annotated with `rank`.
+
+    Matching goes through the partial GIN index on active documents.
+    """
+    search_query = SearchQuery(
+        query, search_type="websearch", config=settings.JOB_SEARCH_CONFIG
+    )
+    documents = JobSearchDocument.objects.filter(
+        is_active=True, search_vector=search_query
+    )
+    if employer_id is not None:
+        documents = documents.filter(employer_id=employer_id)
+    return documents.annotate(
+        rank=SearchRank(F("search_vector"), search_query)
+    ).select_related("job", "job__employer")
@@ -0,0 +1,112 @@
+import hashlib
+from functools import lru_cache
+
+import stripe
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+
+@lru_cache(maxsize=None)
+def get_stripe_client():
+    """
+    Return the process-wide Stripe client.
+
+    The SDK's requests client keeps a `requests.Session` per thread, as
+    sessions aren't safe to share between threads, so each thread reuses its
+    keep-alive connection to the Stripe API instead of paying a TLS handshake
+    per call. Network errors are retried by the SDK up to
+    STRIPE_MAX_NETWORK_RETRIES times with jittered exponential backoff.
+
+    The `*_async` methods, used by the async views, go through an httpx
+    AsyncClient when httpx is installed.
+    """
+    base_addresses = {}
+    if settings.STRIPE_API_BASE:
+        # e.g. a local stripe-mock server
+        base_addresses["api"] = settings.STRIPE_API_BASE
+
+    async_client = None
+    if httpx is not None:
+        async_client = stripe.HTTPXClient(
+            timeout=httpx.Timeout(
+                settings.STRIPE_READ_TIMEOUT, connect=settings.STRIPE_CONNECT_TIMEOUT
+            )
+        )
+
+    return stripe.StripeClient(
+        settings.STRIPE_SECRET_KEY,
+        http_client=stripe.RequestsClient(
+            timeout=(settings.STRIPE_CONNECT_TIMEOUT, settings.STRIPE_READ_TIMEOUT),
+            async_fallback_client=async_client,
+        ),
+        max_network_retries=settings.STRIPE_MAX_NETWORK_RETRIES,
+        base_addresses=base_addresses,
+    )
+
+
+@receiver(setting_changed)
+def reset_stripe_client(*, setting, **kwargs):
+    if setting.startswith("STRIPE_"):
+        get_stripe_client.cache_clear()
+
+
+def _checkout_session_request(price_id, user_id, job_id):
+    """
+    Build the params and options of a checkout session for a job posting.
+
+    The idempotency key is derived from the purchase itself, so a repeated
+    submit for the same user, job and price returns the original session.
+    """
+    idempotency_key = hashlib.sha256(
+        f"checkout:{user_id}:{job_id}:{price_id}".encode()
+    ).hexdigest()
+    params = {
+        "line_items": [
+            {
+                "price": price_id,
+                "quantity": 1,
+            }
+        ],
+        "mode": "payment",
+        "success_url": f"{settings.FRONTEND_URL}/payment/success?session_id={{CHECKOUT_SESSION_ID}}",
+        "cancel_url": f"{settings.FRONTEND_URL}/payment/canceled",
+        "metadata": {
+            "user_id": user_id,
+            "job_id": job_id,
+        },
+    }
+    return params, {"idempotency_key": idempotency_key}
+
+
+def create_checkout_session(price_id, user_id, job_id):
+    """Create a checkout session for a job posting"""
+    params, options = _checkout_session_request(price_id, user_id, job_id)
+    return get_stripe_client().checkout.sessions.create(params=params, options=options)
+
+
+async def create_checkout_session_async(price_id, user_id, job_id):
+    """Create a checkout session for a job posting without blocking the event loop"""
+    params, options = _checkout_session_request(price_id, user_id, job_id)
+    return await get_stripe_client().checkout.sessions.create_async(
+        params=params, options=options
+    )
+
+
+def retrieve_checkout_session(session_id):
+    """Retrieve a checkout session with its line items expanded"""
+    return get_stripe_client().checkout.sessions.retrieve(
+        session_id, params={"expand": ["line_items"]}
+    )
+
+
+def construct_webhook_event(payload, sig_header):
+    """Verify a webhook signature and parse the event"""
+    return get_stripe_client().construct_event(
+        payload, sig_header, settings.STRIPE_WEBHOOK_SECRET
+    )
@@ -0,0 +1,99 @@
+import json
+import logging
+from datetime import timedelta
+
+import stripe
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from api.models.webhook import StripeEvent
+from api.utils.order_utils import fulfil_checkout_session
+from api.utils.queue_utils import delete_in_batches, retry_delay
+from api.utils.stripe_utils import retrieve_checkout_session
+
+logger = logging.getLogger(__name__)
+
+
+def record_stripe_event(event, payload):
+    """
+    Store a verified Stripe event in the inbox for asynchronous processing.
+
+    Redelivered events hit the unique `event_id` and are dropped by the
+    database, so retries from Stripe cost a single INSERT.
+    """
+    StripeEvent.objects.bulk_create(
+        [StripeEvent(event_id=event.id, type=event.type, payload=json.loads(payload))],
+        ignore_conflicts=True,
+    )
+
+
+def handle_stripe_event(stripe_event):
+    if stripe_event.type == "checkout.session.completed":
+        session = stripe.checkout.Session.construct_from(
+            stripe_event.payload["data"]["object"], settings.STRIPE_SECRET_KEY
+        )
+
+        # Retrieve session with line items
+        session_with_items = retrieve_checkout_session(session.id)
+        fulfil_checkout_session(session, session_with_items.line_items.data)
+
+
+def process_stripe_events(batch_size=20):
+    """
+    Process one batch of pending Stripe events from the inbox.
+
+    Each event is handled in its own savepoint so that a failing event is
+    rescheduled without undoing the rest of the batch. Returns a
+    `(processed, failed)` tuple.
+    """
+    processed = failed = 0
+    with transaction.atomic():
+        events = list(
+            StripeEvent.objects.select_for_update(skip_locked=True)
+            .filter(
+                status=StripeEvent.Status.PENDING,
+                next_attempt_at__lte=timezone.now(),
+            )
+            .order_by("next_attempt_at")[:batch_size]
+        )
+        for event in events:
+            event.attempts += 1
+            try:
+                with transaction.atomic():
+                    handle_stripe_event(event)
+            except Exception as e:
+                logger.exception("Failed to process Stripe event %s", event.event_id)
+                failed += 1
+                event.last_error = str(e)
+                if event.attempts >= settings.STRIPE_EVENT_MAX_ATTEMPTS:
+                    event.status = StripeEvent.Status.FAILED
+                else:
+                    event.next_attempt_at = timezone.now() + retry_delay(
+                        event.attempts, settings.STRIPE_EVENT_RETRY_DELAY
+                    )
+            else:
+                processed += 1
+                event.status = StripeEvent.Status.PROCESSED
+                event.processed_at = timezone.now()
+                event.last_error = ""
+
+        StripeEvent.objects.bulk_update(
+            events,
+            ["status", "attempts", "last_error", "next_attempt_at", "processed_at"],
+        )
+    return processed, failed
+
+
+def prune_stripe_events(batch_size=5000):
+    """
+    Delete events processed over STRIPE_EVENT_RETENTION_DAYS ago, in batches.
+    Returns the number of events deleted.
+    """
+    cutoff = timezone.now() - timedelta(days=settings.STRIPE_EVENT_RETENTION_DAYS)
+    return delete_in_batches(
+        StripeEvent.objects.filter(
+            status=StripeEvent.Status.PROCESSED, processed_at__lt=cutoff
+        ),
+        batch_size,
+    )
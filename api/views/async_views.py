@@ -0,0 +1,125 @@
+"""
+Async variants of the views that mostly wait on external services.
+
+These are plain Django async views rather than DRF views, which are sync
+only. Under ASGI they run on the event loop, so a worker can hold many Stripe
+calls and password reset requests in flight at once. Selected with
+ASYNC_VIEWS, see api/urls.
+"""
+
+import json
+import secrets
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import HttpResponseNotAllowed, JsonResponse
+from rest_framework.exceptions import Throttled
+from rest_framework.parsers import JSONParser
+from rest_framework.request import Request
+
+from api.models.auth import PasswordResetToken
+from api.models.user import CustomUser
+from api.serializers.auth_serializers import ResetPasswordEmailSerializer
+from api.throttling import PasswordResetEmailThrottle, PasswordResetIPThrottle
+from api.utils.email_utils import aqueue_email
+from api.utils.price_utils import validate_price
+from api.utils.stripe_utils import create_checkout_session_async
+
+
+def _json_body(request):
+    try:
+        data = json.loads(request.body or b"{}")
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+@sync_to_async
+def _throttle_wait(request, throttle_classes):
+    """
+    Run DRF throttles against a plain Django request, returning the seconds
+    to wait if one of them refuses it, or None.
+    """
+    drf_request = Request(request, parsers=[JSONParser()])
+    for throttle_class in throttle_classes:
+        throttle = throttle_class()
+        if not throttle.allow_request(drf_request, None):
+            return throttle.wait() or 0
+    return None
+
+
+def _throttled_response(wait):
+    response = JsonResponse({"detail": str(Throttled(wait).detail)}, status=429)
+    response["Retry-After"] = str(int(wait))
+    return response
+
+
+async def create_checkout_session(request):
+    if request.method != "POST":
+        return HttpResponseNotAllowed(["POST"])
+
+    data = _json_body(request)
+    if data is None:
+        return JsonResponse({"error": "Invalid JSON body"}, status=400)
+
+    try:
+        price_id = data.get("priceId")
+
+        # Reject unknown prices locally instead of round-tripping to Stripe
+        error = await sync_to_async(validate_price)(price_id, data.get("amount"))
+        if error:
+            return JsonResponse({"error": error}, status=400)
+
+        checkout_session = await create_checkout_session_async(
+            price_id, data.get("userId"), data.get("jobId")
+        )
+
+        return JsonResponse({"url": checkout_session.url})
+    except Exception as e:
+        return JsonResponse({"error": str(e)}, status=400)
+
+
+async def reset_password_email(request):
+    if request.method != "POST":
+        return HttpResponseNotAllowed(["POST"])
+
+    data = _json_body(request)
+    if data is None:
+        return JsonResponse({"error": "Invalid JSON body"}, status=400)
+
+    wait = await _throttle_wait(
+        request, [PasswordResetIPThrottle, PasswordResetEmailThrottle]
+    )
+    if wait is not None:
+        return _throttled_response(wait)
+
+    serializer = ResetPasswordEmailSerializer(data=data)
+    if not serializer.is_valid():
+        return JsonResponse(serializer.errors, status=400)
+
+    email = serializer.data["email"]
+    user = await CustomUser.objects.filter(email=email).afirst()
+    if user is not None:
+        token = secrets.token_urlsafe(32)
+
+        # Create password reset token, storing only its digest
+        await PasswordResetToken.objects.acreate(
+            user=user, token=PasswordResetToken.hash_token(token)
+        )
+
+        reset_url = f"{settings.FRONTEND_URL}/reset-password/{token}"
+
+        await aqueue_email(
+            "Password Reset Request",
+            f"Click the following link to reset your password: {reset_url}",
+            [email],
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            sensitive=True,
+        )
+    return JsonResponse({"message": "Password reset email sent"})
+
+
+# csrf_exempt and require_POST wrap views in a sync function before Django
+# 5.0, hiding the coroutine from the handler, so both are done by hand
+create_checkout_session.csrf_exempt = True
+reset_password_email.csrf_exempt = True
@@ -6,7 +6,8 @@ from allauth.socialaccount.providers.oauth2.client import OAuth2Client
 from dj_rest_auth.registration.views import SocialLoginView
 from django.conf import settings
 from django.contrib.auth.tokens import default_token_generator
-from django.core.mail import send_mail
+from django.db import transaction
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
@@ -25,11 +26,22 @@ from api.serializers.auth_serializers import (
     ResetPasswordEmailSerializer,
     SetUserTypeSerializer,
 )
+from api.throttling import (
+    LoginEmailThrottle,
+    LoginIPThrottle,
+    PasswordResetEmailThrottle,
+    PasswordResetIPThrottle,
+    RegisterIPThrottle,
+)
+from api.tokens import FilteredRefreshToken
+from api.utils.email_utils import queue_email
 
 logger = logging.getLogger(__name__)
 
 
 class RegisterView(APIView):
+    throttle_classes = [RegisterIPThrottle]
+
     def post(self, request):
         serializer = RegisterSerializer(data=request.data)
 
@@ -51,6 +63,8 @@ class RegisterView(APIView):
 
 
 class LoginView(APIView):
+    throttle_classes = [LoginIPThrottle, LoginEmailThrottle]
+
     def post(self, request):
         serializer = LoginSerializer(data=request.data)
 
@@ -71,29 +85,30 @@ class LogoutView(APIView):
     permission_classes = [IsAuthenticated]
 
     def post(self, request):
-        logger.info(f"Logout attempt for user: {request.user.email}")
+        logger.info("Logout attempt for user: %s", request.user.email)
         try:
             refresh_token = request.data.get("refresh_token")
             if not refresh_token:
                 logger.warning(
-                    f"Logout failed for user {request.user.email}: Refresh token not provided"
+                    "Logout failed for user %s: Refresh token not provided",
+                    request.user.email,
                 )
                 return Response(
                     {"error": "Refresh token is required"},
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
-            token = RefreshToken(refresh_token)
+            token = FilteredRefreshToken(refresh_token)
             token.blacklist()
 
-            logger.info(f"User {request.user.email} logged out successfully")
+            logger.info("User %s logged out successfully", request.user.email)
             return Response(
                 {"success": "User logged out successfully"}, status=status.HTTP_200_OK
             )
 
         except TokenError as e:
             logger.error(
-                f"Logout failed for user {request.user.email}: Invalid token - {str(e)}"
+                "Logout failed for user %s: Invalid token - %s", request.user.email, e
             )
             return Response(
                 {"error": f"Invalid token: {str(e)}"},
@@ -102,7 +117,7 @@ class LogoutView(APIView):
 
         except Exception as e:
             logger.exception(
-                f"Unexpected error during logout for user {request.user.email}: {str(e)}"
+                "Unexpected error during logout for user %s: %s", request.user.email, e
             )
             return Response(
                 {"error": f"An unexpected error occurred: {str(e)}"},
@@ -114,9 +129,9 @@ class CustomTokenRefreshView(TokenRefreshView):
     def post(self, request, *args, **kwargs):
         response = super().post(request, *args, **kwargs)
         if response.status_code == 200:
-            logger.info(f"Token refreshed successfully for user: {request.user}")
+            logger.info("Token refreshed successfully for user: %s", request.user)
         else:
-            logger.warning(f"Token refresh failed for user: {request.user}")
+            logger.warning("Token refresh failed for user: %s", request.user)
         return response
 
 
@@ -126,11 +141,14 @@ class ChangePasswordView(APIView):
     def post(self, request):
         serializer = ChangePasswordSerializer(data=request.data)
         if serializer.is_valid():
-            user = request.user
-            if user.check_password(serializer.data["old_password"]):
-                user.set_password(serializer.data["new_password"])
-                user.save()
-                return Response({"message": "Password changed successfully"})
+            with transaction.atomic():
+                # request.user may come from the authentication cache, so
+                # check and update the current row
+                user = CustomUser.objects.select_for_update().get(pk=request.user.pk)
+                if user.check_password(serializer.data["old_password"]):
+                    user.set_password(serializer.data["new_password"])
+                    user.save(update_fields=["password"])
+                    return Response({"message": "Password changed successfully"})
             return Response(
                 {"error": "Incorrect old password"}, status=status.HTTP_400_BAD_REQUEST
             )
@@ -138,6 +156,8 @@ class ChangePasswordView(APIView):
 
 
 class ResetPasswordEmailView(APIView):
+    throttle_classes = [PasswordResetIPThrottle, PasswordResetEmailThrottle]
+
     def post(self, request):
         serializer = ResetPasswordEmailSerializer(data=request.data)
         if serializer.is_valid():
@@ -146,17 +166,19 @@ class ResetPasswordEmailView(APIView):
                 user = CustomUser.objects.get(email=email)
                 token = secrets.token_urlsafe(32)
 
-                # Create password reset token
-                reset_token = PasswordResetToken.objects.create(user=user, token=token)
+                # Create password reset token, storing only its digest
+                PasswordResetToken.objects.create(
+                    user=user, token=PasswordResetToken.hash_token(token)
+                )
 
                 reset_url = f"{settings.FRONTEND_URL}/reset-password/{token}"
 
-                send_mail(
+                queue_email(
                     "Password Reset Request",
                     f"Click the following link to reset your password: {reset_url}",
-                    settings.DEFAULT_FROM_EMAIL,
                     [email],
-                    fail_silently=False,
+                    from_email=settings.DEFAULT_FROM_EMAIL,
+                    sensitive=True,
                 )
                 return Response({"message": "Password reset email sent"})
             except CustomUser.DoesNotExist:
@@ -168,7 +190,11 @@ class ResetPasswordConfirmView(APIView):
     def post(self, request):
         try:
             token = request.data.get("token")
-            reset_token = PasswordResetToken.objects.get(token=token)
+            if not isinstance(token, str):
+                raise PasswordResetToken.DoesNotExist
+            reset_token = PasswordResetToken.objects.select_related("user").get(
+                token=PasswordResetToken.hash_token(token)
+            )
 
             if not reset_token.is_valid:
                 return Response(
@@ -178,13 +204,20 @@ class ResetPasswordConfirmView(APIView):
 
             serializer = ResetPasswordConfirmSerializer(data=request.data)
             if serializer.is_valid():
-                user = reset_token.user
-                user.set_password(serializer.data["new_password"])
-                user.save()
-
-                # Mark token as used
-                reset_token.used = True
-                reset_token.save()
+                with transaction.atomic():
+                    # Mark token as used, unless a concurrent request beat us
+                    claimed = PasswordResetToken.objects.filter(
+                        pk=reset_token.pk, used=False, expires_at__gt=timezone.now()
+                    ).update(used=True)
+                    if not claimed:
+                        return Response(
+                            {"error": "Token has expired or already been used"},
+                            status=status.HTTP_400_BAD_REQUEST,
+                        )
+
+                    user = reset_token.user
+                    user.set_password(serializer.data["new_password"])
+                    user.save(update_fields=["password"])
 
                 return Response({"message": "Password reset successful"})
 
@@ -244,7 +277,7 @@ class GoogleLoginView(SocialLoginView):
             return response
 
         except Exception as e:
-            logger.error(f"Google login error: {str(e)}")
+            logger.error("Google login error: %s", e)
             return Response(
                 {"error": "Failed to process Google login"},
                 status=status.HTTP_400_BAD_REQUEST,
@@ -255,27 +288,32 @@ class SetUserTypeView(APIView):
     permission_classes = [IsAuthenticated]
 
     def post(self, request):
-        if request.user.user_type:
-            return Response(
-                {"error": "User type already set"}, status=status.HTTP_400_BAD_REQUEST
-            )
+        with transaction.atomic():
+            # request.user may come from the authentication cache, so check
+            # the current row, locked against a concurrent request
+            user = CustomUser.objects.select_for_update().get(pk=request.user.pk)
+            if user.user_type:
+                return Response(
+                    {"error": "User type already set"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
 
-        serializer = SetUserTypeSerializer(data=request.data)
-        if serializer.is_valid():
-            user_type = serializer.validated_data["user_type"]
-            request.user.user_type = user_type
-            request.user.save()
+            serializer = SetUserTypeSerializer(data=request.data)
+            if serializer.is_valid():
+                user_type = serializer.validated_data["user_type"]
+                user.user_type = user_type
+                user.save(update_fields=["user_type"])
 
-            if user_type == "EM":
-                Employer.objects.create(user=request.user)
-            elif user_type == "JS":
-                JobSeeker.objects.create(user=request.user)
+                if user_type == "EM":
+                    Employer.objects.create(user=user)
+                elif user_type == "JS":
+                    JobSeeker.objects.create(user=user)
 
-            return Response(
-                {
-                    "message": "User type set successfully",
-                    "user": UserSerializer(request.user).data,
-                }
-            )
+                return Response(
+                    {
+                        "message": "User type set successfully",
+                        "user": UserSerializer(user).data,
+                    }
+                )
 
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
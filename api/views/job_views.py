@@ -0,0 +1,87 @@
+from rest_framework import generics
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from api.models.job_board import Job
+from api.pagination import JobCursorPagination, JobSearchCursorPagination
+from api.serializers.job_serializers import JobSearchResultSerializer, JobSerializer
+from api.utils.cache_utils import cached_job_detail, cached_job_listing, job_cache
+from api.utils.search_utils import search_jobs
+
+
+class JobList(generics.ListAPIView):
+    """Active jobs, newest first, served from the job cache"""
+
+    serializer_class = JobSerializer
+    pagination_class = JobCursorPagination
+    # With the default DatabaseCache, on a job cache miss: the user lookup,
+    # the listing version read and (once per change) its write in three
+    # queries, the payload read, the page of jobs and the payload write in
+    # three more
+    query_budget = 10
+
+    def get_queryset(self):
+        return Job.objects.filter(status=Job.Status.ACTIVE).select_related("employer")
+
+    def list(self, request, *args, **kwargs):
+        data = cached_job_listing(
+            request, lambda: super(JobList, self).list(request, *args, **kwargs).data
+        )
+        return Response(data)
+
+
+class JobDetail(generics.RetrieveAPIView):
+    """One active job, served from the job cache"""
+
+    serializer_class = JobSerializer
+    # With the default DatabaseCache, on a job cache miss: the user lookup,
+    # the payload read, the job and the payload write in three queries
+    query_budget = 6
+
+    def get_queryset(self):
+        return Job.objects.filter(status=Job.Status.ACTIVE).select_related("employer")
+
+    def retrieve(self, request, *args, **kwargs):
+        data = cached_job_detail(
+            self.kwargs["pk"],
+            lambda: super(JobDetail, self).retrieve(request, *args, **kwargs).data,
+        )
+        return Response(data)
+
+
+class JobCacheStats(APIView):
+    """Hit and miss counters of this process's job cache"""
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(job_cache.stats())
+
+
+class JobSearch(generics.ListAPIView):
+    """
+    Ranked full-text search over active jobs.
+
+    `?q=` takes web search syntax ("python -remote", quoted phrases, `or`);
+    `?employer=` limits results to one employer.
+    """
+
+    serializer_class = JobSearchResultSerializer
+    pagination_class = JobSearchCursorPagination
+    # User lookup on an auth cache miss, the page of results
+    query_budget = 2
+
+    def get_queryset(self):
+        query = self.request.query_params.get("q", "").strip()
+        if not query:
+            raise ValidationError({"q": ["This parameter is required."]})
+
+        employer = self.request.query_params.get("employer")
+        if employer is not None and not employer.isdigit():
+            raise ValidationError({"employer": ["A valid integer is required."]})
+
+        return search_jobs(
+            query, employer_id=int(employer) if employer is not None else None
+        )
@@ -1,18 +1,18 @@
 import stripe
-from django.conf import settings
 from django.http import HttpResponse
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
-from rest_framework import status
+from rest_framework import generics, status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from api.models.job_board import Job
 from api.models.order import Order
-from api.serializers.order_serializers import OrderSerializer
-
-stripe.api_key = settings.STRIPE_SECRET_KEY
+from api.pagination import OrderCursorPagination
+from api.serializers.order_serializers import OrderSerializer, StripePriceSerializer
+from api.utils.price_utils import get_active_prices, validate_price
+from api.utils.stripe_utils import construct_webhook_event, create_checkout_session
+from api.utils.webhook_utils import record_stripe_event
 
 
 class CreateCheckoutSession(APIView):
@@ -22,36 +22,62 @@ class CreateCheckoutSession(APIView):
             user_id = request.data.get("userId")
             job_id = request.data.get("jobId")
 
-            checkout_session = stripe.checkout.Session.create(
-                line_items=[
-                    {
-                        "price": price_id,
-                        "quantity": 1,
-                    }
-                ],
-                mode="payment",
-                success_url=f"{settings.FRONTEND_URL}/payment/success?session_id={{CHECKOUT_SESSION_ID}}",
-                cancel_url=f"{settings.FRONTEND_URL}/payment/canceled",
-                metadata={
-                    "user_id": user_id,
-                    "job_id": job_id,
-                },
-            )
+            # Reject unknown prices locally instead of round-tripping to Stripe
+            error = validate_price(price_id, request.data.get("amount"))
+            if error:
+                return Response({"error": error}, status=status.HTTP_400_BAD_REQUEST)
+
+            checkout_session = create_checkout_session(price_id, user_id, job_id)
 
             return Response({"url": checkout_session.url})
         except Exception as e:
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
 
-class OrderList(APIView):
-    permission_classes = [IsAuthenticated]
+class PriceList(APIView):
+    """Active prices served from the local price catalog cache"""
+
+    # User lookup on an auth cache miss, the catalog on a price cache miss
+    query_budget = 2
 
     def get(self, request):
-        orders = Order.objects.filter(user=request.user).order_by("-created_at")
-        serializer = OrderSerializer(orders, many=True)
+        serializer = StripePriceSerializer(get_active_prices().values(), many=True)
         return Response(serializer.data)
 
 
+class OrderList(generics.ListAPIView):
+    """
+    Paginated order history for the current user.
+
+    Pass `?fields=id,amount_total,...` to limit the serialized fields; line
+    items are only fetched when `items` is requested.
+    """
+
+    permission_classes = [IsAuthenticated]
+    serializer_class = OrderSerializer
+    pagination_class = OrderCursorPagination
+    # User lookup on an auth cache miss, the page of orders, their line items
+    query_budget = 3
+
+    def get_requested_fields(self):
+        fields = self.request.query_params.get("fields")
+        if not fields:
+            return None
+        return [field.strip() for field in fields.split(",") if field.strip()]
+
+    def get_queryset(self):
+        # The legacy raw `items` JSON is never serialized, so don't load it
+        queryset = Order.objects.filter(user=self.request.user).defer("items")
+        fields = self.get_requested_fields()
+        if fields is None or "items" in fields:
+            queryset = queryset.prefetch_related("line_items")
+        return queryset
+
+    def get_serializer(self, *args, **kwargs):
+        kwargs["fields"] = self.get_requested_fields()
+        return super().get_serializer(*args, **kwargs)
+
+
 @method_decorator(csrf_exempt, name="dispatch")
 class StripeWebhook(APIView):
     def post(self, request):
@@ -59,37 +85,11 @@ class StripeWebhook(APIView):
         sig_header = request.META.get("HTTP_STRIPE_SIGNATURE")
 
         try:
-            event = stripe.Webhook.construct_event(
-                payload, sig_header, settings.STRIPE_WEBHOOK_SECRET
-            )
-
-            if event.type == "checkout.session.completed":
-                session = event.data.object
-
-                # Retrieve session with line items
-                session_with_items = stripe.checkout.Session.retrieve(
-                    session.id, expand=["line_items"]
-                )
-
-                # Create order
-                Order.objects.create(
-                    user_id=session.metadata.get("user_id"),
-                    email=session.customer_email,
-                    stripe_session_id=session.id,
-                    payment_status=Order.Status.PAID,
-                    amount_total=session.amount_total / 100,
-                    items=session_with_items.line_items.data,
-                )
-
-                # Update job status to ACTIVE
-                job_id = session.metadata.get("job_id")
-                if job_id:
-                    try:
-                        job = Job.objects.get(id=job_id)
-                        job.status = Job.Status.ACTIVE
-                        job.save()
-                    except Job.DoesNotExist:
-                        pass
+            event = construct_webhook_event(payload, sig_header)
+
+            # Persist the event and acknowledge immediately; fulfilment runs in
+            # the `process_stripe_events` worker
+            record_stripe_event(event, payload)
 
             return HttpResponse(status=200)
 
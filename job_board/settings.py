@@ -61,8 +61,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "api.middleware.RequestIdMiddleware",
+    "api.middleware.QueryInstrumentationMiddleware",
     "django.middleware.security.SecurityMiddleware",
-    "whitenoise.middleware.WhiteNoiseMiddleware",
+    "api.middleware.StaticFilesMiddleware",  # Async-capable WhiteNoise
     "corsheaders.middleware.CorsMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -73,6 +75,13 @@ MIDDLEWARE = [
     "allauth.account.middleware.AccountMiddleware",
 ]
 
+# Per-request query count, DB time and slowest statements, reported in the
+# Server-Timing header and on the "api.queries" logger
+QUERY_INSTRUMENTATION = os.environ.get("QUERY_INSTRUMENTATION", "True") == "True"
+SLOW_QUERY_MS = float(os.environ.get("SLOW_QUERY_MS", 100))
+# Raise instead of logging when a view exceeds its `query_budget`
+QUERY_BUDGET_STRICT = os.environ.get("QUERY_BUDGET_STRICT", "False") == "True"
+
 ROOT_URLCONF = "job_board.urls"
 
 TEMPLATES = [
@@ -121,6 +130,26 @@ else:
         }
     }
 
+# Shared cache for the job payloads, throttle counters and cached users. Redis
+# when REDIS_URL is set, otherwise a database table created by
+# `manage.py createcachetable`; either way every process sees the same data.
+if "REDIS_URL" in os.environ:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ.get("REDIS_URL"),
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+            "LOCATION": "django_cache",
+            # The default of 300 would cull listing pages on nearly every set
+            "OPTIONS": {"MAX_ENTRIES": 50000},
+        }
+    }
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -140,6 +169,36 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Password hashing policy: "pbkdf2", "scrypt" or "argon2" (needs argon2-cffi).
+# The selected hasher hashes new passwords; the others still verify existing
+# hashes, which are upgraded to the selected policy on the next login.
+PASSWORD_HASHER = os.environ.get("PASSWORD_HASHER", "pbkdf2")
+PASSWORD_HASHER_PARAMS = {
+    "pbkdf2": {
+        "iterations": int(os.environ.get("PBKDF2_ITERATIONS", 600000)),
+    },
+    "scrypt": {
+        "work_factor": int(os.environ.get("SCRYPT_WORK_FACTOR", 2**14)),
+        "block_size": int(os.environ.get("SCRYPT_BLOCK_SIZE", 8)),
+        "parallelism": int(os.environ.get("SCRYPT_PARALLELISM", 1)),
+    },
+    "argon2": {
+        "time_cost": int(os.environ.get("ARGON2_TIME_COST", 2)),
+        "memory_cost": int(os.environ.get("ARGON2_MEMORY_COST", 102400)),  # KiB
+        "parallelism": int(os.environ.get("ARGON2_PARALLELISM", 8)),
+    },
+}
+PASSWORD_HASHER_CLASSES = {
+    "pbkdf2": "api.hashers.ConfigurablePBKDF2PasswordHasher",
+    "scrypt": "api.hashers.ConfigurableScryptPasswordHasher",
+    "argon2": "api.hashers.ConfigurableArgon2PasswordHasher",
+}
+PASSWORD_HASHERS = [PASSWORD_HASHER_CLASSES[PASSWORD_HASHER]] + [
+    hasher
+    for name, hasher in PASSWORD_HASHER_CLASSES.items()
+    if name != PASSWORD_HASHER
+]
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/4.2/topics/i18n/
@@ -174,50 +233,116 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 AUTH_USER_MODEL = "api.CustomUser"
 
 REST_FRAMEWORK = {
+    # Proxies in front of the app (1 for the Heroku router). Throttles take
+    # the client address from that hop of X-Forwarded-For, which clients
+    # could otherwise set to anything; 0 uses the socket address instead.
+    "NUM_PROXIES": int(os.environ.get("NUM_PROXIES", 1)),
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "api.authentication.CachedJWTAuthentication",
+    ],
+    # orjson-backed JSON, falling back to the stdlib when orjson is missing
+    "DEFAULT_RENDERER_CLASSES": [
+        "api.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "api.parsers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
     ],
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 10,
+    # Sliding window limits for the throttles in api/throttling.py
+    "DEFAULT_THROTTLE_RATES": {
+        "login_ip": os.environ.get("THROTTLE_LOGIN_IP", "30/min"),
+        "login_email": os.environ.get("THROTTLE_LOGIN_EMAIL", "5/min"),
+        "password_reset_ip": os.environ.get("THROTTLE_PASSWORD_RESET_IP", "10/hour"),
+        "password_reset_email": os.environ.get(
+            "THROTTLE_PASSWORD_RESET_EMAIL", "3/hour"
+        ),
+        "register_ip": os.environ.get("THROTTLE_REGISTER_IP", "10/hour"),
+    },
 }
 
+# Where throttle counters live: "local" (per process, single node) or "cache"
+# (the THROTTLE_CACHE_ALIAS cache, shared across nodes)
+THROTTLE_COUNTER_STORE = os.environ.get("THROTTLE_COUNTER_STORE", "local")
+THROTTLE_CACHE_ALIAS = os.environ.get("THROTTLE_CACHE_ALIAS", "default")
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=60),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
     "ROTATE_REFRESH_TOKENS": True,
     "BLACKLIST_AFTER_ROTATION": True,
+    # Embeds a password fingerprint in tokens so password changes revoke them
+    "CHECK_REVOKE_TOKEN": os.environ.get("JWT_CHECK_REVOKE_TOKEN", "False") == "True",
+    "TOKEN_REFRESH_SERIALIZER": "api.tokens.FilteredTokenRefreshSerializer",
 }
 
+# Bloom filter answering "is this refresh token blacklisted" without a query
+JWT_BLACKLIST_FILTER_CAPACITY = int(
+    os.environ.get("JWT_BLACKLIST_FILTER_CAPACITY", 1_000_000)
+)
+JWT_BLACKLIST_FILTER_ERROR_RATE = 0.001
+# Upper bound on how long a token blacklisted by another process is missed
+JWT_BLACKLIST_SYNC_INTERVAL = float(os.environ.get("JWT_BLACKLIST_SYNC_INTERVAL", 1))
+JWT_BLACKLIST_REBUILD_INTERVAL = 3600  # seconds
+
+# Authenticated users are cached per process (and optionally in the shared
+# Django cache) to skip the user lookup on every request
+AUTH_USER_CACHE_TTL = int(os.environ.get("AUTH_USER_CACHE_TTL", 30))  # seconds
+AUTH_USER_CACHE_SIZE = int(os.environ.get("AUTH_USER_CACHE_SIZE", 10000))
+AUTH_USER_CACHE_SHARED = os.environ.get("AUTH_USER_CACHE_SHARED", "False") == "True"
+
+# Route the external-call-heavy endpoints to the async views in
+# api/views/async_views.py. The Procfile serves the app over ASGI only when
+# this is on, and over plain WSGI otherwise.
+ASYNC_VIEWS = os.environ.get("ASYNC_VIEWS", "False") == "True"
+
+# Logging goes through a queue drained by a background thread, see
+# api.utils.log_utils.configure_logging
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO")
+LOG_FORMAT = os.environ.get("LOG_FORMAT", "json")  # "json" or "verbose"
+LOG_FILE = os.environ.get("LOG_FILE", "debug.log")
+LOG_FILE_MAX_BYTES = int(os.environ.get("LOG_FILE_MAX_BYTES", 10 * 1024 * 1024))
+LOG_FILE_BACKUP_COUNT = int(os.environ.get("LOG_FILE_BACKUP_COUNT", 5))
+
+LOGGING_CONFIG = "api.utils.log_utils.configure_logging"
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
     "formatters": {
         "verbose": {
-            "format": "{levelname} {asctime} {module} {process:d} {thread:d} {message}",
+            "format": "{levelname} {asctime} {module} {process:d} {thread:d} {request_id} {message}",
             "style": "{",
         },
         "simple": {
             "format": "{levelname} {message}",
             "style": "{",
         },
+        "json": {
+            "()": "api.utils.log_utils.JsonFormatter",
+        },
     },
     "handlers": {
         "console": {
-            "level": "DEBUG",
+            "level": LOG_LEVEL,
             "class": "logging.StreamHandler",
-            "formatter": "verbose",
+            "formatter": LOG_FORMAT,
         },
         "file": {
-            "level": "DEBUG",
-            "class": "logging.FileHandler",
-            "filename": "debug.log",
-            "formatter": "verbose",
+            "level": LOG_LEVEL,
+            "class": "logging.handlers.RotatingFileHandler",
+            "filename": LOG_FILE,
+            "maxBytes": LOG_FILE_MAX_BYTES,
+            "backupCount": LOG_FILE_BACKUP_COUNT,
+            "formatter": "json",
         },
     },
     "loggers": {
         "": {  # This empty string represents the root logger
             "handlers": ["console", "file"],
-            "level": "DEBUG",
+            "level": LOG_LEVEL,
         },
     },
 }
@@ -235,6 +360,14 @@ EMAIL_HOST_USER = os.environ.get("RESEND_USERNAME")
 EMAIL_HOST_PASSWORD = os.environ.get("RESEND_API_KEY")
 DEFAULT_FROM_EMAIL = os.environ.get("DEFAULT_FROM_EMAIL")
 
+# Outbound email queue, drained by `manage.py send_queued_emails`
+EMAIL_QUEUE_MAX_ATTEMPTS = int(os.environ.get("EMAIL_QUEUE_MAX_ATTEMPTS", 5))
+EMAIL_QUEUE_RETRY_DELAY = int(os.environ.get("EMAIL_QUEUE_RETRY_DELAY", 30))  # seconds
+# Sent emails are deleted this long after sending by `manage.py prune_sent_emails`
+EMAIL_QUEUE_RETENTION_DAYS = int(os.environ.get("EMAIL_QUEUE_RETENTION_DAYS", 30))
+# Employer application notifications within this window are sent as one digest
+EMAIL_DIGEST_WINDOW = int(os.environ.get("EMAIL_DIGEST_WINDOW", 300))  # seconds
+
 # Frontend URL for password reset
 FRONTEND_URL = os.environ.get("FRONTEND_URL", "http://localhost:3000")
 
@@ -243,6 +376,42 @@ STRIPE_PUBLIC_KEY = os.environ.get("STRIPE_PUBLIC_KEY")
 STRIPE_SECRET_KEY = os.environ.get("STRIPE_SECRET_KEY")
 STRIPE_WEBHOOK_SECRET = os.environ.get("STRIPE_WEBHOOK_SECRET")
 
+# Stripe API client: per-thread keep-alive connections, bounded timeouts, retries
+STRIPE_API_BASE = os.environ.get("STRIPE_API_BASE")  # e.g. a local stripe-mock
+STRIPE_CONNECT_TIMEOUT = float(os.environ.get("STRIPE_CONNECT_TIMEOUT", 3))  # seconds
+STRIPE_READ_TIMEOUT = float(os.environ.get("STRIPE_READ_TIMEOUT", 10))  # seconds
+STRIPE_MAX_NETWORK_RETRIES = int(os.environ.get("STRIPE_MAX_NETWORK_RETRIES", 2))
+
+# Seconds each process caches the local price catalog
+PRICE_CACHE_TTL = int(os.environ.get("PRICE_CACHE_TTL", 300))
+
+# Paid job postings expire after JOB_POSTING_DURATION_DAYS and are moved to
+# the ArchivedJob table JOB_ARCHIVE_AFTER_DAYS later, see `manage.py expire_jobs`
+JOB_POSTING_DURATION_DAYS = int(os.environ.get("JOB_POSTING_DURATION_DAYS", 30))
+JOB_ARCHIVE_AFTER_DAYS = int(os.environ.get("JOB_ARCHIVE_AFTER_DAYS", 90))
+
+# Job listing and detail payloads are cached in-process for JOB_CACHE_LOCAL_TTL
+# seconds in front of the JOB_CACHE_ALIAS cache, and invalidated on job changes.
+# The alias must be shared between processes (not LocMemCache) for changes
+# made by one process to reach the others within JOB_CACHE_LOCAL_TTL.
+JOB_CACHE_ALIAS = os.environ.get("JOB_CACHE_ALIAS", "default")
+JOB_CACHE_TTL = int(os.environ.get("JOB_CACHE_TTL", 300))  # seconds
+JOB_CACHE_LOCAL_TTL = int(os.environ.get("JOB_CACHE_LOCAL_TTL", 5))  # seconds
+JOB_CACHE_LOCAL_SIZE = int(os.environ.get("JOB_CACHE_LOCAL_SIZE", 1000))
+
+# Postgres text search configuration used to index and query job postings
+JOB_SEARCH_CONFIG = os.environ.get("JOB_SEARCH_CONFIG", "english")
+
+# Stripe webhook inbox, drained by `manage.py process_stripe_events`
+STRIPE_EVENT_MAX_ATTEMPTS = int(os.environ.get("STRIPE_EVENT_MAX_ATTEMPTS", 8))
+STRIPE_EVENT_RETRY_DELAY = int(
+    os.environ.get("STRIPE_EVENT_RETRY_DELAY", 30)
+)  # seconds
+# Processed events are deleted this long after processing by
+# `manage.py prune_stripe_events`. Keep it well above the 3 days over which
+# Stripe redelivers an event, since the stored event_id is what drops repeats.
+STRIPE_EVENT_RETENTION_DAYS = int(os.environ.get("STRIPE_EVENT_RETENTION_DAYS", 30))
+
 # Google OAuth Settings
 GOOGLE_OAUTH2_CLIENT_ID = os.environ.get("GOOGLE_OAUTH2_CLIENT_ID")
 